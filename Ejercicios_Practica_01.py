@@ -147,11 +147,10 @@ def analizarSecuencias(diccionario_secuencias):
     resultado = {}
     for gen, secuencia in diccionario_secuencias.items():
         longitud = len(secuencia)
-        conteo = {"A": 0, "T": 0, "C": 0, "G": 0}
         
-        for nucleotido in secuencia:
-            if nucleotido in conteo:
-                conteo[nucleotido] += 1
+        # Conteo de cada nucleótido (en mayúsculas, como pide el enunciado),
+        # con count() en C igual que Composicion.simbolo de Julio-2019
+        conteo = {nuc: secuencia.count(nuc) for nuc in ("A", "T", "C", "G")}
         
         # Calcular porcentajes
         analisis = {}
@@ -162,7 +161,7 @@ def analizarSecuencias(diccionario_secuencias):
         # Calcular si es alto GC
         # si el porcentaje de G y C es mayor al 50% 
         # devuelve True, de lo contrario False
-        analisis["alto_gc"] = (conteo["G"] + conteo["C"]) / longitud > 0.5
+        analisis["alto_gc"] = longitud > 0 and (conteo["G"] + conteo["C"]) / longitud > 0.5
         
         resultado[gen] = analisis
     
@@ -0,0 +1,237 @@
+# Banco de pruebas de rendimiento para las funciones de eje1.py
+
+"""
+Mide el rendimiento de las distintas implementaciones de la distancia de
+Hamming de eje1.py (dHamming, dHamming_v2, los motores acelerados y las
+variantes por lotes y acotada) con secuencias aleatorias de 10 pb hasta
+100 Mpb.
+
+Para cada implementación y tamaño se guarda:
+- El mejor tiempo de varias repeticiones (timeit)
+- El rendimiento en bases por segundo
+- El pico de memoria reservada durante una ejecución (tracemalloc)
+
+Los resultados se escriben en un fichero JSON para poder comparar entre
+ejecuciones y detectar regresiones (opción --comparar).
+
+Uso:
+    python benchmark_eje1.py
+    python benchmark_eje1.py --max 1000000 --salida hoy.json --comparar ayer.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+from functools import partial
+
+from eje1 import (SecuenciaEmpaquetada, dHamming, dHamming_v2, dHamming_empaquetado,
+                  dHamming_lote, dHamming_acotada)
+
+
+# Tabla que convierte cualquier byte en una base: el byte b pasa a "ACGT"[b % 4]
+_BYTES_A_BASES = bytes(b"ACGT"[b % 4] for b in range(256))
+
+
+def generar_secuencia(longitud, generador):
+    """
+    Genera una secuencia aleatoria de ADN de forma reproducible y rápida.
+
+    Parámetros:
+    - longitud (int): Número de bases
+    - generador (random.Random): Generador con semilla fija
+
+    Retorna:
+    - str: Secuencia de longitud bases sobre el alfabeto "ACGT"
+    """
+    return generador.randbytes(longitud).translate(_BYTES_A_BASES).decode("ascii")
+
+
+def implementaciones():
+    """
+    Devuelve las implementaciones a medir.
+
+    Retorna:
+    - dict: {nombre: (preparar, calcular, lenta)} donde preparar(a, b)
+            transforma las entradas una vez (fuera de la medición; None si
+            no hace falta), calcular recibe lo que devuelve preparar, y lenta
+            indica si es un bucle Python (se limita con --limite-lento)
+    """
+    return {
+        "dHamming": (None, dHamming, True),
+        "dHamming_v2": (None, dHamming_v2, True),
+        "dHamming_confiar": (None, partial(dHamming, confiar=True), True),
+        "dHamming_empaquetado": (None, dHamming_empaquetado, False),
+        "SecuenciaEmpaquetada.distancia": (_empaquetar, SecuenciaEmpaquetada.distancia, False),
+        "dHamming_lote": (_como_lote, _distancia_lote, False),
+        "dHamming_acotada": (None, _distancia_acotada, False),
+    }
+
+
+def _empaquetar(a, b):
+    """Empaqueta las dos secuencias (preparación de SecuenciaEmpaquetada.distancia)."""
+    return SecuenciaEmpaquetada(a), SecuenciaEmpaquetada(b)
+
+
+def _como_lote(a, b):
+    """Pasa b a una lista de una sola candidata (preparación de dHamming_lote)."""
+    return a, [b]
+
+
+def _distancia_lote(sonda, candidatas):
+    """dHamming_lote con una candidata; devuelve su distancia como las demás."""
+    return dHamming_lote(sonda, candidatas)[0]
+
+
+def _distancia_acotada(a, b):
+    """
+    dHamming_acotada con k = len(a), así nunca sale antes de tiempo y da la
+    misma distancia que las demás (es el peor caso de la versión acotada).
+    """
+    return dHamming_acotada(a, b, len(a))
+
+
+def medir(calcular, a, b, repeticiones):
+    """
+    Mide una implementación con unas entradas concretas.
+
+    Parámetros:
+    - calcular (function): Función a medir, calcular(a, b)
+    - a, b: Entradas ya preparadas
+    - repeticiones (int): Número de repeticiones; se queda el mejor tiempo
+
+    Retorna:
+    - tuple: (mejor_tiempo_en_segundos, pico_de_memoria_en_bytes, resultado)
+    """
+    # Ajustamos el número de llamadas por repetición para que cada medida
+    # dure al menos ~0.2 s y el tiempo no quede dominado por el reloj
+    temporizador = timeit.Timer(lambda: calcular(a, b))
+    llamadas, _ = temporizador.autorange()
+    mejor = min(temporizador.repeat(repeat=repeticiones, number=llamadas)) / llamadas
+
+    # La memoria se mide aparte porque tracemalloc ralentiza la ejecución
+    tracemalloc.start()
+    resultado = calcular(a, b)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return mejor, pico, resultado
+
+
+def ejecutar(tamanos, repeticiones=3, limite_lento=10_000_000, semilla=2019):
+    """
+    Ejecuta el banco de pruebas completo.
+
+    Parámetros:
+    - tamanos (list): Longitudes de secuencia a probar
+    - repeticiones (int): Repeticiones por medida
+    - limite_lento (int): Tamaño máximo para las implementaciones en Python puro
+    - semilla (int): Semilla del generador aleatorio
+
+    Retorna:
+    - dict: Resultados con metadatos y una lista de medidas
+    """
+    generador = random.Random(semilla)
+    medidas = []
+
+    for longitud in tamanos:
+        a = generar_secuencia(longitud, generador)
+        b = generar_secuencia(longitud, generador)
+        esperado = None
+
+        for nombre, (preparar, calcular, lenta) in implementaciones().items():
+            if lenta and longitud > limite_lento:
+                continue
+
+            entradas = preparar(a, b) if preparar is not None else (a, b)
+            tiempo, pico, resultado = medir(calcular, *entradas, repeticiones)
+
+            # Todas las implementaciones deben dar la misma distancia
+            if esperado is None:
+                esperado = resultado
+            elif resultado != esperado:
+                raise AssertionError(f"{nombre} da {resultado} y se esperaba {esperado} (n={longitud})")
+
+            medidas.append({
+                "implementacion": nombre,
+                "longitud": longitud,
+                "segundos": tiempo,
+                "bases_por_segundo": longitud / tiempo if tiempo > 0 else None,
+                "pico_memoria_bytes": pico,
+            })
+            print(f"{nombre:32} {longitud:>11} pb  {tiempo:12.6f} s  "
+                  f"{longitud / tiempo if tiempo > 0 else 0:14.0f} pb/s  {pico:>12} B")
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "semilla": semilla,
+        "repeticiones": repeticiones,
+        "medidas": medidas,
+    }
+
+
+def comparar(actual, anterior, tolerancia=0.10):
+    """
+    Compara dos ejecuciones y muestra las medidas que han empeorado.
+
+    Parámetros:
+    - actual, anterior (dict): Resultados devueltos por ejecutar()
+    - tolerancia (float): Empeoramiento relativo a partir del cual se avisa
+
+    Retorna:
+    - list: Tuplas (implementacion, longitud, cociente) de las regresiones
+    """
+    previas = {(m["implementacion"], m["longitud"]): m["segundos"] for m in anterior["medidas"]}
+    regresiones = []
+
+    for medida in actual["medidas"]:
+        clave = (medida["implementacion"], medida["longitud"])
+        if clave in previas and previas[clave] > 0:
+            cociente = medida["segundos"] / previas[clave]
+            if cociente > 1 + tolerancia:
+                regresiones.append((clave[0], clave[1], cociente))
+
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco de pruebas de dHamming")
+    parser.add_argument("--min", type=int, default=10, help="Longitud mínima (pb)")
+    parser.add_argument("--max", type=int, default=100_000_000, help="Longitud máxima (pb)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--limite-lento", type=int, default=10_000_000,
+                        help="Longitud máxima para las versiones en Python puro")
+    parser.add_argument("--semilla", type=int, default=2019)
+    parser.add_argument("--salida", default="benchmark_eje1.json", help="Fichero JSON de resultados")
+    parser.add_argument("--comparar", help="Fichero JSON de una ejecución anterior")
+    args = parser.parse_args()
+
+    # Tamaños en potencias de 10 entre --min y --max
+    tamanos = []
+    longitud = args.min
+    while longitud <= args.max:
+        tamanos.append(longitud)
+        longitud *= 10
+
+    resultados = ejecutar(tamanos, args.repeticiones, args.limite_lento, args.semilla)
+
+    with open(args.salida, "w") as f:
+        json.dump(resultados, f, indent=2)
+    print(f"\nResultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            anterior = json.load(f)
+        regresiones = comparar(resultados, anterior)
+        if regresiones:
+            print("\n=== Regresiones ===")
+            for nombre, longitud, cociente in regresiones:
+                print(f"{nombre} con {longitud} pb: {cociente:.2f} veces más lento")
+        else:
+            print("\nSin regresiones respecto a la ejecución anterior")
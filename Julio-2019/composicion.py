@@ -0,0 +1,127 @@
+# Motor de composición de nucleótidos de eje3.py
+
+"""
+Composición de nucleótidos de una secuencia (conteos de bases, códigos IUPAC
+ambiguos y bases enmascaradas). eje3.py lo usa para el porcentaje GC.
+"""
+
+from collections import Counter
+
+
+# Símbolos que más aparecen; el resto se cuenta de una vez con un Counter
+_SIMBOLOS_FRECUENTES = b"ACGTNacgtn"
+
+# Códigos IUPAC de posiciones ambiguas (N = cualquier base), en mayúsculas
+# y minúsculas
+_IUPAC_AMBIGUOS = b"RYSWKMBDHVNryswkmbdhvn"
+
+# Letras minúsculas (bases enmascaradas en soft-masking)
+_MINUSCULAS = bytes(range(ord("a"), ord("z") + 1))
+
+# G y C en mayúsculas y minúsculas
+_BASES_GC = b"GCgc"
+
+
+class Composicion:
+    """
+    Composición de nucleótidos de una secuencia (str o bytes).
+    
+    Nada se cuenta hasta que se consulta, y cada conteo se hace en C y se
+    guarda para no repetirlo; así cada función solo paga por lo que
+    consulta (fraccion_gc no construye un histograma completo):
+    - un símbolo: bytes.count
+    - un grupo de símbolos (G+C, enmascaradas, ambiguas): una sola pasada
+      de translate que borra todo el grupo; los que faltan son los del grupo
+    
+    Ejemplo:
+        comp = composicionNucleotidos("ACGTacgtNR")
+        comp.base("G")        # 2 (G y g)
+        comp.simbolo("g")     # 1
+        comp.enmascaradas     # 4
+        comp.ambiguas         # 2 (N y R)
+    """
+    
+    def __init__(self, secuencia):
+        self.longitud = len(secuencia)
+        if isinstance(secuencia, str):
+            # En UTF-8 los caracteres no ASCII nunca contienen bytes ASCII,
+            # así que los conteos de bases son exactos
+            self._datos = secuencia.encode()
+        elif isinstance(secuencia, (bytes, bytearray)):
+            self._datos = secuencia
+        else:
+            self._datos = bytes(secuencia)
+        self._simbolos = {}
+        self._grupos = {}
+    
+    def simbolo(self, simbolo):
+        """Número de apariciones de un símbolo, distinguiendo mayúsculas."""
+        num = self._simbolos.get(simbolo)
+        if num is None:
+            num = self._simbolos[simbolo] = self._datos.count(simbolo.encode())
+        return num
+    
+    def base(self, base):
+        """Número de apariciones de una base sin distinguir mayúsculas."""
+        base = base.upper()
+        num = self.simbolo(base)
+        if base.lower() != base:
+            num += self.simbolo(base.lower())
+        return num
+    
+    def _grupo(self, simbolos):
+        """Número de apariciones de cualquiera de los símbolos (bytes) dados."""
+        num = self._grupos.get(simbolos)
+        if num is None:
+            num = self._grupos[simbolos] = len(self._datos) - len(self._datos.translate(None, simbolos))
+        return num
+    
+    @property
+    def enmascaradas(self):
+        """Número de bases en minúscula (enmascaradas)."""
+        return self._grupo(_MINUSCULAS)
+    
+    @property
+    def ambiguas(self):
+        """
+        Número de posiciones con un código IUPAC ambiguo (incluida N), sin
+        distinguir mayúsculas.
+        """
+        return self._grupo(_IUPAC_AMBIGUOS)
+    
+    def fraccion_gc(self):
+        """Fracción de G y C (sin distinguir mayúsculas); 0.0 si está vacía."""
+        if self.longitud == 0:
+            return 0.0
+        return self._grupo(_BASES_GC) / self.longitud
+    
+    def conteos(self):
+        """
+        Conteo de todos los símbolos de la secuencia, distinguiendo mayúsculas.
+        
+        Retorna:
+        - dict: {símbolo: número}; A, C, G, T, N (y sus minúsculas) siempre
+                aparecen, el resto solo si están en la secuencia
+        """
+        resultado = {chr(s): self.simbolo(chr(s)) for s in _SIMBOLOS_FRECUENTES}
+        if sum(resultado.values()) < self.longitud:
+            resto = self._datos.translate(None, _SIMBOLOS_FRECUENTES)
+            resultado.update(Counter(resto.decode(errors="replace")))
+        return resultado
+    
+    def __repr__(self):
+        return f"Composicion(longitud={self.longitud}, conteos={self.conteos()})"
+
+
+def composicionNucleotidos(secuencia):
+    """
+    Calcula la composición de nucleótidos de una secuencia: conteos de A, C,
+    G, T, N, códigos IUPAC ambiguos y bases en minúscula (ver Composicion).
+    
+    Parámetros:
+    - secuencia (str o bytes): Secuencia de ADN
+    
+    Retorna:
+    - Composicion: Objeto con los conteos (se calculan al consultarlos)
+    """
+    return Composicion(secuencia)
@@ -1,6 +1,63 @@
 # Apellidos, Nombre: [Tu nombre aquí]
 
-def dHamming(adn1, adn2, alfabeto="ATCG"):
+import mmap
+from array import array
+from functools import lru_cache
+from multiprocessing import Pool
+
+from lectura_fasta import eventos_fasta as _eventos_fasta
+
+
+def _texto_alfabeto(alfabeto):
+    """
+    Pasa el alfabeto a str. Se admite cualquier contenedor de caracteres
+    (lista, conjunto, frozenset...), como en la comprobación original con
+    'in'; el validador en caché necesita un str (hashable y codificable).
+    """
+    if isinstance(alfabeto, str):
+        return alfabeto
+    return "".join(alfabeto)
+
+
+@lru_cache(maxsize=64)
+def _validador_alfabeto(alfabeto):
+    """
+    Compila un alfabeto en una función de validación y la guarda en caché.
+    
+    Cada alfabeto distinto se compila una sola vez (con expulsión LRU si se
+    usan más de 64). La validación elimina de la cadena todos los caracteres
+    válidos con bytes.translate, una única pasada en C: si no queda nada,
+    la cadena es válida.
+    
+    Parámetros:
+    - alfabeto (str): Caracteres válidos
+    
+    Retorna:
+    - function: validar(cadena) -> bool, acepta str o bytes
+    """
+    try:
+        validos = alfabeto.encode("latin-1")
+    except UnicodeEncodeError:
+        # Alfabetos con caracteres de más de un byte: conjunto de caracteres
+        conjunto = frozenset(alfabeto)
+        
+        def validar(cadena):
+            if not isinstance(cadena, str):
+                cadena = bytes(cadena).decode("latin-1")
+            return conjunto.issuperset(cadena)
+        return validar
+    
+    def validar(cadena):
+        if isinstance(cadena, str):
+            try:
+                cadena = cadena.encode("latin-1")
+            except UnicodeEncodeError:
+                return False
+        return not cadena.translate(None, validos)
+    return validar
+
+
+def dHamming(adn1, adn2, alfabeto="ATCG", modo="simple", confiar=False):
     """
     Calcula la distancia de Hamming entre dos cadenas de ADN.
     
@@ -10,30 +67,44 @@ def dHamming(adn1, adn2, alfabeto="ATCG"):
     Parámetros:
     - adn1 (str): Primera cadena de ADN
     - adn2 (str): Segunda cadena de ADN
-    - alfabeto (str): Caracteres válidos permitidos (por defecto "ATCG")
+    - alfabeto (str o contenedor de caracteres): Caracteres válidos
+                  permitidos (por defecto "ATCG")
+    - modo (str): "simple" (bucle carácter a carácter) o "empaquetado"
+                  (XOR + popcount sobre la codificación de 2 bits, ver
+                  dHamming_empaquetado)
+    - confiar (bool): Si es True se omite la validación del alfabeto (para
+                      entradas ya validadas)
     
     Retorna:
     - int: Distancia de Hamming si las cadenas son válidas
     - -1: Si las cadenas tienen diferente longitud o contienen caracteres inválidos
     
+    Lanza:
+    - ValueError: Si modo no es "simple" ni "empaquetado"
+    
     Pseudocódigo:
     1. Verificar que ambas cadenas tengan la misma longitud
     2. Verificar que todos los caracteres pertenezcan al alfabeto
     3. Contar las diferencias posición por posición
     """
     
+    alfabeto = _texto_alfabeto(alfabeto)
+    
+    # Modo acelerado: delegamos en el motor empaquetado
+    if modo == "empaquetado":
+        return dHamming_empaquetado(adn1, adn2, alfabeto, confiar)
+    if modo != "simple":
+        raise ValueError(f"Modo desconocido: {modo!r} (se esperaba 'simple' o 'empaquetado')")
+    
     # Paso 1: Verificar que las cadenas tengan la misma longitud
     if len(adn1) != len(adn2):
         return -1
     
-    # Paso 2: Verificar que todos los caracteres de adn1 estén en el alfabeto
-    for caracter in adn1:
-        if caracter not in alfabeto:
-            return -1
-    
-    # Paso 3: Verificar que todos los caracteres de adn2 estén en el alfabeto
-    for caracter in adn2:
-        if caracter not in alfabeto:
+    # Pasos 2 y 3: Verificar que todos los caracteres de adn1 y adn2 estén
+    # en el alfabeto, con el validador compilado (y cacheado) del alfabeto
+    if not confiar:
+        validar = _validador_alfabeto(alfabeto)
+        if not validar(adn1) or not validar(adn2):
             return -1
     
     # Paso 4: Calcular la distancia de Hamming
@@ -67,6 +138,697 @@ def dHamming_v2(adn1, adn2, alfabeto="ATCG"):
     return sum(1 for c1, c2 in zip(adn1, adn2) if c1 != c2)
 
 
+# ---------------------------------------------------------------------------
+# Motor empaquetado: 2 bits por base (A=00, C=01, G=10, T=11)
+# ---------------------------------------------------------------------------
+
+# Tabla de traducción byte -> código de 2 bits. Los bytes que no son A/C/G/T
+# se dejan como están; la validación se hace antes con translate(None, ...)
+_CODIGOS_2BITS = bytes.maketrans(b"ACGT", b"\x00\x01\x02\x03")
+_BASES_ADN = b"ACGT"
+
+
+class SecuenciaEmpaquetada:
+    """
+    Secuencia de ADN almacenada con 2 bits por base (4 bases por byte).
+    
+    Ocupa una cuarta parte de la memoria de la cadena original y permite
+    calcular la distancia de Hamming con operaciones XOR + popcount sobre
+    enteros grandes, que CPython procesa palabra a palabra en C.
+    
+    Atributos:
+    - datos (bytes): Bases empaquetadas (la base i ocupa los bits 2*(i%4)
+                     del byte i//4)
+    - longitud (int): Número de bases de la secuencia original
+    
+    Lanza:
+    - ValueError: Si la secuencia contiene caracteres fuera de "ACGT"
+    """
+    
+    __slots__ = ("datos", "longitud")
+    
+    def __init__(self, adn):
+        # Aceptamos str o bytes; los caracteres no ASCII nunca son bases válidas
+        if isinstance(adn, str):
+            try:
+                adn = adn.encode("ascii")
+            except UnicodeEncodeError:
+                raise ValueError("La secuencia contiene caracteres no válidos")
+        
+        # translate(None, borrar) elimina las bases válidas: si queda algo,
+        # la secuencia contenía caracteres fuera del alfabeto
+        if adn.translate(None, _BASES_ADN):
+            raise ValueError("La secuencia contiene caracteres no válidos")
+        
+        self.longitud = len(adn)
+        
+        # Paso 1: cada base pasa a valer 0..3 (un byte por base)
+        codigos = adn.translate(_CODIGOS_2BITS)
+        
+        # Paso 2: rellenamos hasta múltiplo de 4 con código 0 (no afecta a la
+        # distancia porque ambas secuencias comparadas tienen la misma longitud)
+        codigos += b"\x00" * (-len(codigos) % 4)
+        
+        # Paso 3: juntamos 4 códigos en cada byte. Tomando las posiciones
+        # 0, 1, 2, 3 (mod 4) como enteros grandes y desplazándolas 0, 2, 4 y
+        # 6 bits, cada código queda dentro de su propio byte sin desbordar
+        num_bytes = len(codigos) // 4
+        empaquetado = 0
+        for desplazamiento in range(4):
+            empaquetado |= int.from_bytes(codigos[desplazamiento::4], "little") << (2 * desplazamiento)
+        self.datos = empaquetado.to_bytes(num_bytes, "little")
+    
+    def __len__(self):
+        return self.longitud
+    
+    def __eq__(self, otra):
+        if not isinstance(otra, SecuenciaEmpaquetada):
+            return NotImplemented
+        return self.longitud == otra.longitud and self.datos == otra.datos
+    
+    def __hash__(self):
+        return hash((self.longitud, self.datos))
+    
+    def __str__(self):
+        # Desempaquetamos cada byte en sus 4 bases y recortamos el relleno
+        bases = "ACGT"
+        return "".join(bases[(byte >> (2 * i)) & 3]
+                       for byte in self.datos for i in range(4))[:self.longitud]
+    
+    def __repr__(self):
+        return f"SecuenciaEmpaquetada({str(self)!r})"
+    
+    def distancia(self, otra):
+        """
+        Distancia de Hamming con otra SecuenciaEmpaquetada.
+        
+        Retorna:
+        - int: Número de bases distintas
+        - -1: Si las secuencias tienen diferente longitud
+        """
+        if self.longitud != otra.longitud:
+            return -1
+        
+        # XOR: los pares de bits distintos de 00 marcan bases diferentes
+        x = int.from_bytes(self.datos, "little") ^ int.from_bytes(otra.datos, "little")
+        
+        # Plegamos cada par de bits en su bit bajo y contamos los bits a 1
+        mascara = int.from_bytes(b"\x55" * len(self.datos), "little")
+        return ((x | (x >> 1)) & mascara).bit_count()
+
+
+def _distancia_bytes(b1, b2):
+    """
+    Distancia de Hamming entre dos bytes de igual longitud sin bucle Python.
+    
+    Hace XOR de ambas secuencias como enteros grandes y pliega cada byte
+    distinto de cero en su bit bajo para contarlos con bit_count().
+    """
+    x = int.from_bytes(b1, "little") ^ int.from_bytes(b2, "little")
+    return _marcar_diferencias(x, len(b1)).bit_count()
+
+
+def _marcar_diferencias(x, num_bytes):
+    """
+    Pliega cada byte distinto de cero del entero x en su bit bajo.
+    
+    El resultado tiene un 1 en el bit 0 de cada byte que difería y 0 en el
+    resto, de modo que bit_count() o to_bytes().count(1) dan las diferencias.
+    """
+    x |= x >> 4
+    x |= x >> 2
+    x |= x >> 1
+    return x & int.from_bytes(b"\x01" * num_bytes, "little")
+
+
+def dHamming_empaquetado(adn1, adn2, alfabeto="ATCG", confiar=False):
+    """
+    Distancia de Hamming usando el motor empaquetado de 2 bits.
+    
+    Mantiene la semántica de dHamming (-1 si las longitudes difieren o hay
+    caracteres fuera del alfabeto). Con el alfabeto de ADN por defecto se
+    empaquetan las secuencias y se usa XOR + popcount; con un alfabeto
+    personalizado se compara a nivel de bytes, también sin bucle Python.
+    
+    Parámetros:
+    - adn1, adn2 (str, bytes o SecuenciaEmpaquetada): Secuencias a comparar
+    - alfabeto (str): Caracteres válidos permitidos (por defecto "ATCG")
+    - confiar (bool): Si es True se omite la validación del alfabeto; al
+                      empaquetar solo se comprueba que sean bases A/C/G/T
+    
+    Retorna:
+    - int: Distancia de Hamming, o -1 si las secuencias no son válidas
+    """
+    # Paso 1: la longitud se comprueba antes de empaquetar nada
+    if len(adn1) != len(adn2):
+        return -1
+    alfabeto = _texto_alfabeto(alfabeto)
+    
+    # Paso 2: si ya vienen empaquetadas solo queda calcular la distancia
+    if isinstance(adn1, SecuenciaEmpaquetada) and isinstance(adn2, SecuenciaEmpaquetada):
+        return adn1.distancia(adn2)
+    
+    # Paso 3: alfabeto de ADN (o un subconjunto) -> camino empaquetado
+    if set(alfabeto) <= set("ACGT"):
+        sobrantes = "ACGT".translate(str.maketrans("", "", alfabeto))
+        try:
+            empaquetadas = []
+            for adn in (adn1, adn2):
+                if not isinstance(adn, SecuenciaEmpaquetada):
+                    # Las bases de ACGT ausentes del alfabeto también son inválidas
+                    # (en bytes se buscan sus códigos ASCII)
+                    prohibidas = sobrantes.encode("ascii") if isinstance(adn, bytes) else sobrantes
+                    if prohibidas and not confiar and any(base in adn for base in prohibidas):
+                        return -1
+                    adn = SecuenciaEmpaquetada(adn)
+                empaquetadas.append(adn)
+        except ValueError:
+            return -1
+        return empaquetadas[0].distancia(empaquetadas[1])
+    
+    # Paso 4: alfabeto personalizado -> comparación a nivel de bytes
+    if isinstance(adn1, SecuenciaEmpaquetada):
+        adn1 = str(adn1)
+    if isinstance(adn2, SecuenciaEmpaquetada):
+        adn2 = str(adn2)
+    try:
+        # latin-1 da un byte por carácter; si no cabe, usamos la versión simple
+        b1 = adn1 if isinstance(adn1, bytes) else adn1.encode("latin-1")
+        b2 = adn2 if isinstance(adn2, bytes) else adn2.encode("latin-1")
+        alfabeto.encode("latin-1")
+    except UnicodeEncodeError:
+        return dHamming(adn1, adn2, alfabeto, confiar=confiar)
+    
+    if not confiar:
+        validar = _validador_alfabeto(alfabeto)
+        if not validar(b1) or not validar(b2):
+            return -1
+    return _distancia_bytes(b1, b2)
+
+
+# ---------------------------------------------------------------------------
+# Comparación de una sonda contra muchas candidatas
+# ---------------------------------------------------------------------------
+
+def dHamming_lote(sonda, candidatas, alfabeto="ATCG", tam_bloque=4096, confiar=False):
+    """
+    Calcula la distancia de Hamming de una sonda contra muchas candidatas.
+    
+    La sonda se valida una sola vez. Las candidatas se agrupan en bloques de
+    tam_bloque filas que se concatenan en una "matriz" de bytes (una fila por
+    candidata) y se comparan contra la sonda repetida con un único XOR, así
+    la memoria usada depende del tamaño del bloque y no del total.
+    
+    Parámetros:
+    - sonda (str): Secuencia de referencia
+    - candidatas (iterable de str o bytes): Secuencias a comparar con la sonda
+    - alfabeto (str): Caracteres válidos permitidos (por defecto "ATCG")
+    - tam_bloque (int): Número de candidatas procesadas a la vez
+    - confiar (bool): Si es True no se valida el alfabeto (solo la longitud)
+    
+    Retorna:
+    - list: Distancia de cada candidata, en el mismo orden; -1 para las
+            candidatas inválidas (o todas -1 si la sonda es inválida)
+    """
+    candidatas = list(candidatas)
+    alfabeto = _texto_alfabeto(alfabeto)
+    
+    # Paso 1: validar la sonda una única vez
+    try:
+        sonda_b = sonda.encode("latin-1")
+        alfabeto.encode("latin-1")
+    except UnicodeEncodeError:
+        # Caracteres de más de un byte: no hay representación a nivel de bytes
+        return [dHamming(sonda, c, alfabeto, confiar=confiar) for c in candidatas]
+    
+    validar = _validador_alfabeto(alfabeto)
+    if not confiar and not validar(sonda_b):
+        return [-1] * len(candidatas)
+    
+    longitud = len(sonda_b)
+    distancias = []
+    sonda_bloque = None  # Sonda repetida tam_bloque veces, se calcula una vez
+    
+    # Paso 2: procesar las candidatas por bloques
+    for inicio in range(0, len(candidatas), tam_bloque):
+        bloque = candidatas[inicio:inicio + tam_bloque]
+        filas = []
+        validas = []
+        
+        for candidata in bloque:
+            try:
+                fila = candidata.encode("latin-1") if isinstance(candidata, str) else bytes(candidata)
+            except UnicodeEncodeError:
+                fila = None
+            
+            es_valida = (fila is not None and len(fila) == longitud
+                         and (confiar or validar(fila)))
+            # Las filas inválidas se rellenan con la sonda para no romper la matriz
+            filas.append(fila if es_valida else sonda_b)
+            validas.append(es_valida)
+        
+        # Paso 3: una sola comparación XOR para todo el bloque
+        matriz = b"".join(filas)
+        if len(bloque) == tam_bloque:
+            if sonda_bloque is None:
+                sonda_bloque = int.from_bytes(sonda_b * tam_bloque, "little")
+            referencia = sonda_bloque
+        else:
+            referencia = int.from_bytes(sonda_b * len(bloque), "little")
+        x = int.from_bytes(matriz, "little") ^ referencia
+        diferencias = _marcar_diferencias(x, len(matriz)).to_bytes(len(matriz), "little")
+        
+        # Paso 4: contar las diferencias de cada fila sin copiarla
+        for i, es_valida in enumerate(validas):
+            if es_valida:
+                distancias.append(diferencias.count(1, i * longitud, (i + 1) * longitud))
+            else:
+                distancias.append(-1)
+    
+    return distancias
+
+
+# ---------------------------------------------------------------------------
+# Matriz de distancias todos contra todos
+# ---------------------------------------------------------------------------
+
+# Secuencias compartidas con los procesos del pool (se fijan en _iniciar_trabajador)
+_secuencias_matriz = None
+
+
+def _iniciar_trabajador(secuencias):
+    """Guarda las secuencias en cada proceso para no enviarlas con cada tesela."""
+    global _secuencias_matriz
+    _secuencias_matriz = secuencias
+
+
+def _calcular_tesela(tarea):
+    """
+    Calcula una tesela (bloque de filas x bloque de columnas) de la matriz y
+    la escribe directamente en el fichero mapeado en memoria, junto con su
+    simétrica. Solo se calculan las posiciones j > i (triángulo superior).
+    """
+    fichero, n, fila_ini, fila_fin, col_ini, col_fin, alfabeto = tarea
+    secuencias = _secuencias_matriz
+    
+    with open(fichero, "r+b") as f:
+        with mmap.mmap(f.fileno(), 0) as mapa:
+            matriz = memoryview(mapa).cast("i")
+            for i in range(fila_ini, fila_fin):
+                # Diagonal: 0, o -1 si la secuencia no es válida (como dHamming)
+                if col_ini <= i < col_fin:
+                    matriz[i * n + i] = dHamming_lote(secuencias[i], [secuencias[i]], alfabeto)[0]
+                # En las teselas de la diagonal empezamos a la derecha de i
+                inicio = max(col_ini, i + 1)
+                if inicio >= col_fin:
+                    continue
+                distancias = array("i", dHamming_lote(secuencias[i], secuencias[inicio:col_fin], alfabeto))
+                # Fila i (triángulo superior) en un solo bloque
+                matriz[i * n + inicio:i * n + col_fin] = distancias
+                # Columna i (triángulo inferior) por simetría
+                for j, d in zip(range(inicio, col_fin), distancias):
+                    matriz[j * n + i] = d
+            matriz.release()
+
+
+class MatrizDistancias:
+    """
+    Matriz N x N de distancias de Hamming guardada en un fichero mapeado en
+    memoria (enteros de 32 bits, fila a fila).
+    
+    matriz[i, j] es la distancia entre las secuencias i y j, o -1 si el par
+    no es válido. El mapeo sigue abierto hasta llamar a close(), o hasta
+    salir del bloque with.
+    
+    Ejemplo:
+        with dHamming_matriz(secuencias, "distancias.bin") as matriz:
+            matriz[0, 1]
+    
+    Atributos:
+    - n (int): Número de secuencias
+    - mapa (mmap.mmap o None): Fichero mapeado (None si n es 0)
+    - vista (memoryview): Vista N x N de enteros sobre el mapa
+    """
+    
+    def __init__(self, fichero, n):
+        self.n = n
+        if n == 0:
+            # mmap no admite ficheros vacíos
+            self.mapa = None
+            self.vista = memoryview(array("i"))
+        else:
+            with open(fichero, "r+b") as f:
+                self.mapa = mmap.mmap(f.fileno(), 0)
+            self.vista = memoryview(self.mapa).cast("i", (n, n))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        # La vista se libera antes: mmap no se deja cerrar con vistas vivas
+        self.vista.release()
+        if self.mapa is not None:
+            self.mapa.close()
+    
+    def __len__(self):
+        return self.n
+    
+    def __getitem__(self, posicion):
+        return self.vista[posicion]
+
+
+def dHamming_matriz(secuencias, fichero="distancias.bin", alfabeto="ATCG",
+                    tam_bloque=256, procesos=None):
+    """
+    Calcula la matriz N x N de distancias de Hamming entre todas las secuencias.
+    
+    La matriz se guarda en un fichero binario (enteros de 32 bits, fila a
+    fila) mapeado en memoria, así puede ser mayor que la RAM disponible. Se
+    divide en teselas de tam_bloque x tam_bloque que se reparten entre un pool
+    de procesos; solo se calculan las teselas del triángulo superior y cada
+    una escribe también su simétrica.
+    
+    Parámetros:
+    - secuencias (list): Lista de secuencias a comparar
+    - fichero (str): Fichero donde se guarda la matriz
+    - alfabeto (str): Caracteres válidos permitidos (por defecto "ATCG")
+    - tam_bloque (int): Lado de cada tesela
+    - procesos (int): Número de procesos (None = número de CPUs,
+                      1 = sin pool, en el proceso actual)
+    
+    Retorna:
+    - MatrizDistancias: Matriz sobre el fichero mapeado (matriz[i, j] es la
+                        distancia, -1 si el par no es válido); hay que
+                        cerrarla con close() o usarla en un bloque with
+    """
+    secuencias = list(secuencias)
+    n = len(secuencias)
+    
+    # Paso 1: crear el fichero con el tamaño final
+    with open(fichero, "wb") as f:
+        f.truncate(n * n * array("i").itemsize)
+    if n == 0:
+        return MatrizDistancias(fichero, 0)
+    
+    # Paso 2: generar las teselas del triángulo superior (col >= fila)
+    tareas = [(fichero, n, fi, min(fi + tam_bloque, n), fj, min(fj + tam_bloque, n), alfabeto)
+              for fi in range(0, n, tam_bloque)
+              for fj in range(fi, n, tam_bloque)]
+    
+    # Paso 3: repartir las teselas entre los procesos
+    if procesos == 1:
+        _iniciar_trabajador(secuencias)
+        for tarea in tareas:
+            _calcular_tesela(tarea)
+    else:
+        with Pool(procesos, initializer=_iniciar_trabajador, initargs=(secuencias,)) as pool:
+            for _ in pool.imap_unordered(_calcular_tesela, tareas):
+                pass
+    
+    # Paso 4: devolver la matriz sobre el fichero mapeado
+    return MatrizDistancias(fichero, n)
+
+
+# ---------------------------------------------------------------------------
+# Búsqueda acotada: ¿distancia <= k?
+# ---------------------------------------------------------------------------
+
+def dHamming_acotada(adn1, adn2, k, alfabeto="ATCG", tam_tramo=256, confiar=False):
+    """
+    Distancia de Hamming con salida temprana en cuanto se supera k.
+    
+    Compara las secuencias por tramos de tam_tramo caracteres (cada tramo con
+    un XOR a nivel de bytes) y deja de comparar en cuanto las diferencias
+    acumuladas superan k, sin recorrer el resto de la cadena. Cada tramo se
+    valida justo antes de compararlo, así que la salida temprana también se
+    ahorra la validación del resto.
+    
+    Parámetros:
+    - adn1, adn2 (str): Secuencias a comparar
+    - k (int): Distancia máxima que interesa
+    - alfabeto (str): Caracteres válidos permitidos (por defecto "ATCG")
+    - tam_tramo (int): Caracteres comparados en cada paso
+    - confiar (bool): Si es True se omite la validación del alfabeto
+    
+    Retorna:
+    - int: La distancia si es <= k, o k + 1 si se supera antes de llegar a
+           ningún carácter inválido
+    - -1: Si las cadenas tienen diferente longitud o hay caracteres inválidos
+          en la parte comparada
+    """
+    if len(adn1) != len(adn2):
+        return -1
+    
+    alfabeto = _texto_alfabeto(alfabeto)
+    try:
+        alfabeto.encode("latin-1")
+    except UnicodeEncodeError:
+        distancia = dHamming(adn1, adn2, alfabeto, confiar=confiar)
+        return distancia if distancia <= k else k + 1
+    
+    validar = None if confiar else _validador_alfabeto(alfabeto)
+    
+    # Caso habitual al demultiplexar: coincidencia exacta (aquí sí hay que
+    # validar la cadena entera, porque la distancia 0 depende de toda ella)
+    if adn1 == adn2:
+        return 0 if validar is None or validar(adn1) else -1
+    
+    distancia = 0
+    for inicio in range(0, len(adn1), tam_tramo):
+        tramo1 = adn1[inicio:inicio + tam_tramo]
+        tramo2 = adn2[inicio:inicio + tam_tramo]
+        if validar is not None and not (validar(tramo1) and validar(tramo2)):
+            return -1
+        try:
+            distancia += _distancia_bytes(tramo1.encode("latin-1"), tramo2.encode("latin-1"))
+        except UnicodeEncodeError:
+            # Solo con confiar=True puede haber caracteres de más de un byte
+            distancia += sum(c1 != c2 for c1, c2 in zip(tramo1, tramo2))
+        if distancia > k:
+            return k + 1
+    return distancia
+
+
+class IndicePalomar:
+    """
+    Índice de secuencias de referencia para buscar las que están a distancia
+    de Hamming <= k de una lectura (principio del palomar).
+    
+    Cada referencia se divide en k + 1 segmentos. Si una lectura está a
+    distancia <= k, como mucho k segmentos tienen alguna diferencia, así que
+    al menos uno coincide exactamente. Por eso basta con buscar cada segmento
+    de la lectura en un diccionario y verificar solo esas candidatas, en lugar
+    de comparar contra todas las referencias.
+    
+    Parámetros:
+    - referencias (iterable de str): Secuencias de referencia
+    - k (int): Distancia máxima soportada por el índice
+    - alfabeto (str): Caracteres válidos permitidos (por defecto "ATCG")
+    
+    Las referencias con caracteres inválidos no se indexan, porque dHamming
+    nunca daría una distancia válida para ellas.
+    """
+    
+    def __init__(self, referencias, k, alfabeto="ATCG"):
+        self.k = k
+        self.alfabeto = alfabeto
+        self.referencias = []
+        # {longitud: [ {segmento: [índices de referencias]} por cada segmento ]}
+        self._tablas = {}
+        
+        for referencia in referencias:
+            self.agregar(referencia)
+    
+    def _cortes(self, longitud):
+        """Límites (inicio, fin) de los k + 1 segmentos para una longitud."""
+        partes = self.k + 1
+        return [(longitud * p // partes, longitud * (p + 1) // partes) for p in range(partes)]
+    
+    def agregar(self, referencia):
+        """
+        Añade una referencia al índice.
+        
+        Retorna:
+        - int: Posición de la referencia en self.referencias, o -1 si no es válida
+        """
+        # Una referencia es válida si su distancia consigo misma no es -1
+        if dHamming_acotada(referencia, referencia, 0, self.alfabeto) == -1:
+            return -1
+        
+        posicion = len(self.referencias)
+        self.referencias.append(referencia)
+        
+        longitud = len(referencia)
+        if longitud not in self._tablas:
+            self._tablas[longitud] = [{} for _ in range(self.k + 1)]
+        tablas = self._tablas[longitud]
+        
+        for tabla, (inicio, fin) in zip(tablas, self._cortes(longitud)):
+            tabla.setdefault(referencia[inicio:fin], []).append(posicion)
+        return posicion
+    
+    def buscar(self, lectura, k=None):
+        """
+        Busca las referencias a distancia <= k de la lectura.
+        
+        Parámetros:
+        - lectura (str): Secuencia a buscar
+        - k (int): Distancia máxima (por defecto la del índice; no puede ser mayor)
+        
+        Retorna:
+        - list: Tuplas (referencia, distancia) ordenadas por distancia
+        """
+        if k is None:
+            k = self.k
+        elif k > self.k:
+            raise ValueError(f"El índice solo admite búsquedas con k <= {self.k}")
+        
+        tablas = self._tablas.get(len(lectura))
+        if tablas is None:
+            return []
+        
+        # Paso 1: reunir candidatas que coinciden en algún segmento
+        candidatas = set()
+        for tabla, (inicio, fin) in zip(tablas, self._cortes(len(lectura))):
+            candidatas.update(tabla.get(lectura[inicio:fin], ()))
+        
+        # Paso 2: verificar cada candidata con la distancia acotada
+        resultados = []
+        for posicion in sorted(candidatas):
+            referencia = self.referencias[posicion]
+            distancia = dHamming_acotada(lectura, referencia, k, self.alfabeto)
+            if 0 <= distancia <= k:
+                resultados.append((referencia, distancia))
+        
+        resultados.sort(key=lambda par: par[1])
+        return resultados
+
+
+# ---------------------------------------------------------------------------
+# Comparación en streaming de dos ficheros FASTA alineados
+# ---------------------------------------------------------------------------
+
+def _registros_fasta(fichero, tam_trozo):
+    """
+    Abre un FASTA en binario y agrupa los eventos de _eventos_fasta
+    (lectura_fasta.py) por registro.
+    
+    Genera tuplas (cabecera, trozos) donde cabecera es el texto de la
+    cabecera sin '>' y trozos es un iterador con los trozos de secuencia de
+    ese registro. Si no se consume entero, se agota automáticamente antes de
+    pasar al siguiente registro. La secuencia que aparezca antes de la
+    primera cabecera se ignora.
+    """
+    with open(fichero, "rb") as f:
+        eventos = _eventos_fasta(f, tam_trozo)
+        siguiente = [next(eventos, None)]
+        
+        while siguiente[0] is not None and siguiente[0][0] != "cabecera":
+            siguiente[0] = next(eventos, None)
+        
+        def trozos():
+            while True:
+                evento = next(eventos, None)
+                if evento is None or evento[0] == "cabecera":
+                    siguiente[0] = evento
+                    return
+                yield evento[1]
+        
+        while siguiente[0] is not None:
+            cabecera = siguiente[0][1].decode("utf-8", "replace")
+            siguiente[0] = None
+            iterador = trozos()
+            yield cabecera, iterador
+            for _ in iterador:
+                pass
+
+
+def _distancia_trozos(trozos1, trozos2, validar):
+    """
+    Distancia de Hamming entre dos secuencias que llegan por trozos.
+    
+    Avanza por ambas a la vez comparando el prefijo común de los trozos
+    pendientes, así solo hay en memoria un trozo de cada secuencia.
+    
+    Retorna:
+    - int: Distancia acumulada, o -1 si las longitudes difieren o algún
+           trozo contiene caracteres fuera del alfabeto
+    """
+    distancia = 0
+    valida = True
+    pendiente1 = pendiente2 = b""
+    fin1 = fin2 = False
+    
+    while True:
+        if not pendiente1 and not fin1:
+            pendiente1 = next(trozos1, b"")
+            fin1 = not pendiente1
+        if not pendiente2 and not fin2:
+            pendiente2 = next(trozos2, b"")
+            fin2 = not pendiente2
+        if fin1 or fin2:
+            break
+        
+        n = min(len(pendiente1), len(pendiente2))
+        a, pendiente1 = pendiente1[:n], pendiente1[n:]
+        b, pendiente2 = pendiente2[:n], pendiente2[n:]
+        if valida:
+            if validar(a) and validar(b):
+                distancia += _distancia_bytes(a, b)
+            else:
+                # Seguimos leyendo solo para comprobar longitudes
+                valida = False
+    
+    # Las longitudes coinciden solo si ambas secuencias terminan a la vez
+    if pendiente1 or pendiente2:
+        return -1
+    if not fin1 and next(trozos1, b""):
+        return -1
+    if not fin2 and next(trozos2, b""):
+        return -1
+    
+    return distancia if valida else -1
+
+
+def dHamming_fasta(fichero1, fichero2, alfabeto="ATCG", tam_trozo=1 << 20):
+    """
+    Calcula la distancia de Hamming registro a registro entre dos FASTA.
+    
+    Los dos ficheros se leen a la vez, por trozos de tam_trozo bytes, y la
+    distancia de cada registro se acumula trozo a trozo, de modo que la
+    memoria usada no depende de la longitud de las secuencias.
+    
+    Parámetros:
+    - fichero1, fichero2 (str): Ficheros FASTA con los registros en el mismo orden
+    - alfabeto (str): Caracteres válidos permitidos (por defecto "ATCG")
+    - tam_trozo (int): Bytes leídos de cada fichero en cada lectura
+    
+    Genera:
+    - tuple: (cabecera, distancia) por registro, con la cabecera del primer
+             fichero (sin '>'). La distancia es -1 si las secuencias tienen
+             distinta longitud o caracteres inválidos.
+    
+    Lanza:
+    - ValueError: Si un fichero tiene más registros que el otro (después
+                  de generar los registros que tienen los dos)
+    """
+    validar = _validador_alfabeto(_texto_alfabeto(alfabeto))
+    registros2 = _registros_fasta(fichero2, tam_trozo)
+    
+    for cabecera, trozos1 in _registros_fasta(fichero1, tam_trozo):
+        registro2 = next(registros2, None)
+        if registro2 is None:
+            raise ValueError(f"{fichero1} tiene más registros que {fichero2} (sobra '{cabecera}')")
+        yield cabecera, _distancia_trozos(trozos1, registro2[1], validar)
+    
+    # Registros sobrantes del segundo fichero
+    registro2 = next(registros2, None)
+    if registro2 is not None:
+        raise ValueError(f"{fichero2} tiene más registros que {fichero1} (sobra '{registro2[0]}')")
+
 if __name__ == "__main__":
     # Casos de prueba proporcionados en el examen
     print("=== Pruebas de la función dHamming ===")
@@ -93,4 +855,68 @@ if __name__ == "__main__":
     
     # Comparación con versión alternativa
     print("\n=== Verificando versión alternativa ===")
-    print(f'dHamming_v2(p,q) = {dHamming_v2(p,q)}')  # Debe dar 35 también
\ No newline at end of file
+    print(f'dHamming_v2(p,q) = {dHamming_v2(p,q)}')  # Debe dar 35 también
+    
+    # Motor empaquetado de 2 bits
+    print("\n=== Verificando versión empaquetada ===")
+    print(f'dHamming(p,q,modo="empaquetado") = {dHamming(p,q,modo="empaquetado")}')  # Esperado: 35
+    print(f'dHamming_empaquetado("abcd","abbb","abcd") = {dHamming_empaquetado("abcd","abbb","abcd")}')  # Esperado: 2
+    print(f'dHamming_empaquetado("abcd","abbb") = {dHamming_empaquetado("abcd","abbb")}')  # Esperado: -1
+    print(f'dHamming_empaquetado("ACGT","AC") = {dHamming_empaquetado("ACGT","AC")}')  # Esperado: -1
+    print(f'dHamming_empaquetado(b"ACGA",b"ACCA","ACG") = {dHamming_empaquetado(b"ACGA",b"ACCA","ACG")}')  # Esperado: 1
+    print(f'dHamming_empaquetado(b"ACGT",b"ACGA","ACG") = {dHamming_empaquetado(b"ACGT",b"ACGA","ACG")}')  # Esperado: -1
+    print(f'dHamming_empaquetado(b"abcd",b"abbb","abcd") = {dHamming_empaquetado(b"abcd",b"abbb","abcd")}')  # Esperado: 2
+    sp, sq = SecuenciaEmpaquetada(p), SecuenciaEmpaquetada(q)
+    print(f'{len(p)} bases ocupan {len(sp.datos)} bytes empaquetadas')
+    print(f'sp.distancia(sq) = {sp.distancia(sq)}')  # Esperado: 35
+    
+    # Una sonda contra varias candidatas
+    print("\n=== Verificando versión por lotes ===")
+    print(f'dHamming_lote("AAAA", ["ACAA","AAAA","AC","abcd"]) = '
+          f'{dHamming_lote("AAAA", ["ACAA","AAAA","AC","abcd"])}')  # Esperado: [1, 0, -1, -1]
+    
+    # Matriz de distancias todos contra todos
+    print("\n=== Verificando matriz de distancias ===")
+    import os
+    import tempfile
+    fichero_matriz = os.path.join(tempfile.gettempdir(), "distancias_prueba.bin")
+    with dHamming_matriz(["AAAA", "ACAA", "CCCC", "AC"], fichero_matriz, procesos=2) as matriz:
+        for i in range(4):
+            print([matriz[i, j] for j in range(4)])
+    # Esperado: [0, 1, 4, -1] / [1, 0, 3, -1] / [4, 3, 0, -1] / [-1, -1, -1, 0]
+    print(f'matriz.mapa.closed = {matriz.mapa.closed}')  # Esperado: True
+    os.remove(fichero_matriz)
+    
+    # Búsqueda acotada e índice del palomar
+    print("\n=== Verificando búsqueda acotada ===")
+    print(f'dHamming_acotada(p,q,3) = {dHamming_acotada(p,q,3)}')  # Esperado: 4 (se supera k)
+    print(f'dHamming_acotada("AAAA","ACAA",1) = {dHamming_acotada("AAAA","ACAA",1)}')  # Esperado: 1
+    indice = IndicePalomar(["AACCGGTT", "AACCGGTA", "TTTTTTTT", "AACXGGTT"], k=1)
+    print(f'indice.buscar("AACCGGTT") = {indice.buscar("AACCGGTT")}')
+    # Esperado: [('AACCGGTT', 0), ('AACCGGTA', 1)]
+    
+    # Validador de alfabeto compilado y entradas de confianza
+    print("\n=== Verificando validador de alfabeto ===")
+    print(f'dHamming(p,q,confiar=True) = {dHamming(p,q,confiar=True)}')  # Esperado: 35
+    print(f'Alfabetos compilados: {_validador_alfabeto.cache_info().currsize}')
+    print(f'dHamming("ACGT","ACCT",["A","C","G","T"]) = {dHamming("ACGT","ACCT",["A","C","G","T"])}')  # Esperado: 1
+    print(f'dHamming("ACGT","ACCT",frozenset("ACGT")) = {dHamming("ACGT","ACCT",frozenset("ACGT"))}')  # Esperado: 1
+    print(f'dHamming("ACGT","ACXT",set("ACGT")) = {dHamming("ACGT","ACXT",set("ACGT"))}')  # Esperado: -1
+    
+    # Comparación en streaming de dos FASTA
+    print("\n=== Verificando comparación de ficheros FASTA ===")
+    fasta1 = os.path.join(tempfile.gettempdir(), "hamming_1.fa")
+    fasta2 = os.path.join(tempfile.gettempdir(), "hamming_2.fa")
+    with open(fasta1, "w") as f:
+        f.write(f">sec1\n{p[:30]}\n{p[30:]}\n>sec2\nAAAA\n>sec3\nACGT\n")
+    with open(fasta2, "w") as f:
+        f.write(f">sec1\n{q}\n>sec2\nACAA\n>sec3\nAC\n")
+    for cabecera, distancia in dHamming_fasta(fasta1, fasta2, tam_trozo=16):
+        print(f"{cabecera}: {distancia}")
+    # Esperado: sec1: 35 / sec2: 1 / sec3: -1
+    with open(fasta2, "w") as f:
+        f.write(f">sec1\n{q}\n")
+    try:
+        list(dHamming_fasta(fasta1, fasta2))
+    except ValueError as e:
+        print(f"Distinto número de registros: {e}")  # Esperado: ... tiene más registros ... (sobra 'sec2')
@@ -1,5 +1,21 @@
 # Apellidos, Nombre: [Tu nombre aquí]
 
+import codecs
+import gzip
+import heapq
+import math
+import mmap
+import os
+import re
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from multiprocessing import Pool
+
+
 def dameResiduos(molecula):
     """
     Analiza una cadena en formato PDB y cuenta los átomos por residuo.
@@ -84,6 +100,1039 @@ def dameResiduos_v3(molecula):
     return dict(Counter(residuos))
 
 
+# ---------------------------------------------------------------------------
+# Versión por fichero, en streaming y sin objetos str por línea
+# ---------------------------------------------------------------------------
+
+# Nombre de residuo (columnas 18-20) de cada línea ATOM; con '.' no se pasa
+# del final de línea, así las líneas cortas dan un nombre más corto (o vacío).
+# Empezar por el literal "\nATOM" (en vez de ^ con MULTILINE) permite al
+# motor de expresiones regulares saltar directamente a cada candidata
+_PATRON_RESIDUO_ATOM = re.compile(rb"\nATOM(?:.{13}(.{0,3}))?")
+
+# Cada byte del nombre se traduce a un símbolo de 6 bits:
+# 0 = espacio, 1-26 = A-Z, 27-36 = 0-9, 37-62 = a-z, 63 = otro. Los demás
+# espacios en blanco (tabuladores...) son "otro": el nombre se decodifica
+# tal cual y strip() solo los quita de los extremos, como en dameResiduos
+_SIMBOLOS = (b" ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789abcdefghijklmnopqrstuvwxyz")
+_CODIGO_SIMBOLO = bytes(_SIMBOLOS.index(b) if b in _SIMBOLOS else 63 for b in range(256))
+_SIMBOLO_OTRO = 63
+
+
+def dameResiduosFichero(nomfich, tam_trozo=1 << 23):
+    """
+    Cuenta los átomos por residuo de un fichero PDB sin cargarlo entero.
+    
+    Devuelve el mismo diccionario que dameResiduos (mismo orden de aparición),
+    pero leyendo el fichero en binario por trozos grandes. Los nombres de
+    residuo se extraen con una expresión regular sobre los bytes del trozo
+    (sin crear un str por línea), cada nombre distinto se cuenta con
+    bytes.count y el total se acumula en una tabla de enteros preasignada,
+    indexada por el código de 18 bits del nombre (6 bits por carácter).
+    
+    Las columnas se cuentan en bytes, lo que solo equivale a contarlas en
+    caracteres si el fichero es ASCII. Si aparece algún byte no ASCII (por
+    ejemplo un nombre en UTF-8), el fichero se vuelve a leer en modo texto
+    línea a línea (ver _dameResiduosTexto), con la misma codificación que
+    usaría dameResiduos(open(nomfich).read()).
+    
+    Parámetros:
+    - nomfich (str): Ruta del fichero PDB
+    - tam_trozo (int): Bytes leídos en cada lectura
+    
+    Retorna:
+    - dict: Diccionario {nombre_residuo: número_de_átomos}
+            Diccionario vacío si el fichero no existe
+    """
+    # Tabla de contadores: una posición por cada código posible (64^3)
+    tabla = array("q", bytes(8 * 64 ** 3))
+    orden = []      # Códigos en orden de primera aparición
+    otros = {}      # Nombres con caracteres fuera de la tabla de símbolos
+    
+    try:
+        with open(nomfich, "rb") as f:
+            resto = b""
+            while True:
+                trozo = f.read(tam_trozo)
+                
+                # Solo procesamos líneas completas; la última línea incompleta
+                # se guarda para el siguiente trozo
+                if trozo:
+                    bloque = resto + trozo
+                    corte = bloque.rfind(b"\n") + 1
+                    bloque, resto = bloque[:corte], bloque[corte:]
+                else:
+                    bloque, resto = resto, b""
+                
+                # Con bytes no ASCII las columnas no coinciden con caracteres
+                if not bloque.isascii():
+                    return _dameResiduosTexto(nomfich)
+                
+                # El salto de línea inicial permite reconocer la primera línea
+                nombres = _PATRON_RESIDUO_ATOM.findall(b"\n" + bloque)
+                if nombres:
+                    # Los nombres distintos (pocos) en orden de aparición
+                    distintos = dict.fromkeys(nombres)
+                    
+                    # Delimitamos cada nombre con saltos de línea para contar
+                    # cada uno con bytes.count (una búsqueda en C por nombre)
+                    unidos = b"\n" + b"\n\n".join(nombres) + b"\n"
+                    
+                    for nombre in distintos:
+                        if nombre:
+                            cuenta = unidos.count(b"\n" + nombre + b"\n")
+                        else:
+                            # El nombre vacío no se puede delimitar así
+                            cuenta = nombres.count(b"")
+                        
+                        codigos = nombre.ljust(3).translate(_CODIGO_SIMBOLO)
+                        if _SIMBOLO_OTRO in codigos:
+                            clave = nombre.decode("ascii").strip()
+                            if clave not in otros:
+                                orden.append(clave)
+                                otros[clave] = 0
+                            otros[clave] += cuenta
+                            continue
+                        codigo = (codigos[0] << 12) | (codigos[1] << 6) | codigos[2]
+                        if tabla[codigo] == 0:
+                            orden.append(codigo)
+                        tabla[codigo] += cuenta
+                
+                if not trozo:
+                    break
+    
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {nomfich}")
+        return {}
+    
+    # Pasamos de códigos a nombres; nombres como " DA" y "DA " se juntan
+    # al quitar espacios, igual que hace strip() en dameResiduos
+    residuos = {}
+    for codigo in orden:
+        if isinstance(codigo, str):
+            nombre, cuenta = codigo, otros[codigo]
+        else:
+            nombre = "".join(chr(_SIMBOLOS[(codigo >> d) & 63]) for d in (12, 6, 0)).strip()
+            cuenta = tabla[codigo]
+        residuos[nombre] = residuos.get(nombre, 0) + cuenta
+    
+    return residuos
+
+
+def _dameResiduosTexto(nomfich):
+    """
+    Versión de dameResiduosFichero para ficheros con caracteres no ASCII:
+    recorre el fichero en modo texto línea a línea, igual que dameResiduos_v2
+    pero sin cargarlo entero.
+    """
+    residuos = {}
+    with open(nomfich) as f:
+        for linea in f:
+            if linea.startswith("ATOM"):
+                nombre_residuo = linea[17:20].strip()
+                residuos[nombre_residuo] = residuos.get(nombre_residuo, 0) + 1
+    return residuos
+
+
+# ---------------------------------------------------------------------------
+# Tabla columnar de átomos (ATOM/HETATM) mapeada en memoria
+# ---------------------------------------------------------------------------
+
+# Tramos de líneas ATOM/HETATM seguidas (cada línea con su salto de línea).
+# Se obtiene un objeto por tramo (normalmente uno por cadena), no por línea;
+# el literal "\n" inicial acelera la búsqueda
+_PATRON_TRAMO_ATOMOS = re.compile(rb"\n((?:(?:ATOM|HETATM)[^\n]*\n)+)")
+_PATRON_TRAMO_INICIAL = re.compile(rb"(?:(?:ATOM|HETATM)[^\n]*\n)+")
+
+_ANCHO_LINEA = 80    # Ancho estándar de una línea PDB
+_ANCHO_MINIMO = 66   # Hasta el factor B; las líneas más cortas se rellenan
+
+# Tabla de traducción: 0 para los separadores de split() y 1 para el resto
+_OCUPADO = bytes(0 if b in b" \t\n\r\x0b\x0c" else 1 for b in range(256))
+
+# Tabla de traducción: 0 para el byte 0 y 1 para el resto
+_DISTINTO_DE_CERO = bytes([0] + [1] * 255)
+
+
+def _extraer_columna(bloque, ancho_linea, inicio, ancho, paso, relleno=b"\x00"):
+    """
+    Extrae una columna de ancho fijo de todas las filas de un bloque.
+    
+    El bloque contiene n filas de ancho_linea bytes seguidas. Cada byte de
+    la columna se copia con una asignación por rebanadas con salto (en C):
+    el byte k de todas las filas es bloque[inicio + k::ancho_linea].
+    
+    Retorna:
+    - bytearray: n registros de paso bytes; cada uno lleva los ancho bytes
+                 de la columna seguidos de bytes de relleno
+    """
+    n = len(bloque) // ancho_linea
+    salida = bytearray(relleno * (paso * n))
+    for k in range(ancho):
+        salida[k::paso] = bloque[inicio + k::ancho_linea]
+    return salida
+
+
+def _decodificar(codigo, ancho):
+    """Pasa un código entero (bytes en little-endian) al texto sin espacios."""
+    return codigo.to_bytes(8, "little")[:ancho].decode("latin-1").strip()
+
+
+class TablaAtomos:
+    """
+    Tabla columnar con los átomos (líneas ATOM y HETATM) de un fichero PDB.
+    
+    Todas las líneas se guardan en un único bloque de filas de ancho fijo y
+    cada campo se extrae como una columna completa mediante rebanadas con
+    salto, sin recorrer las líneas en Python. Los campos de texto se guardan
+    como arrays de códigos enteros (los bytes del campo en little-endian),
+    que es lo que usan los conteos, y los numéricos como arrays de reales.
+    Cada columna se calcula la primera vez que se usa.
+    
+    Columnas (una posición por átomo):
+    - registro (list): "ATOM" o "HETATM"
+    - nombre (list): Nombre del átomo (columnas 13-16)
+    - residuo (list): Nombre del residuo (columnas 18-20)
+    - cadena (list): Identificador de cadena (columna 22)
+    - num_residuo (array 'l'): Número de residuo (columnas 23-26)
+    - x, y, z (array 'd'): Coordenadas en Å (columnas 31-54)
+    - ocupacion (array 'd'): Ocupación (columnas 55-60)
+    - factor_b (array 'd'): Factor de temperatura (columnas 61-66)
+    
+    Los campos numéricos vacíos o mal formados valen NaN (o 0 si son enteros).
+    """
+    
+    # Campos de texto: (inicio, ancho) con índices de Python
+    _CAMPOS_TEXTO = {"registro": (0, 6), "nombre": (12, 4), "residuo": (17, 3), "cadena": (21, 1)}
+    
+    # Campos numéricos: (inicio, ancho, tipo de array)
+    _CAMPOS_NUMERICOS = {
+        "num_residuo": (22, 4, "l"),
+        "x": (30, 8, "d"),
+        "y": (38, 8, "d"),
+        "z": (46, 8, "d"),
+        "ocupacion": (54, 6, "d"),
+        "factor_b": (60, 6, "d"),
+    }
+    
+    def __init__(self, tramos=()):
+        """
+        Construye la tabla a partir de tramos de líneas ATOM/HETATM (bytes),
+        cada línea terminada en salto de línea.
+        Normalmente se usan desde_texto() o desde_fichero().
+        """
+        tramos = list(tramos)
+        
+        # Paso 1: comprobar si todas las líneas miden lo mismo. En un tramo de
+        # líneas de ancho w, los saltos de línea están justo en tramo[w-1::w]
+        anchos = set()
+        for tramo in tramos:
+            ancho = tramo.find(b"\n") + 1
+            n = len(tramo) // ancho
+            uniforme = len(tramo) == n * ancho and tramo[ancho - 1::ancho] == b"\n" * n
+            anchos.add(ancho if uniforme else None)
+        
+        if len(anchos) == 1 and None not in anchos and min(anchos) > _ANCHO_MINIMO:
+            # Caso habitual: cada fila es una línea completa con su salto de
+            # línea y el bloque se usa tal cual, sin separar las líneas
+            self._ancho = anchos.pop()
+            self._bloque = b"".join(tramos)
+        else:
+            # Líneas de distinto ancho: se recortan o rellenan a 80 caracteres
+            lineas = b"".join(tramos).split(b"\n")[:-1]
+            self._ancho = _ANCHO_LINEA
+            self._bloque = b"".join(linea.rstrip(b"\r")[:_ANCHO_LINEA].ljust(_ANCHO_LINEA)
+                                    for linea in lineas)
+        
+        self._n = len(self._bloque) // self._ancho if self._ancho else 0
+        self._columnas = {}
+    
+    @classmethod
+    def desde_datos(cls, datos):
+        """
+        Construye la tabla a partir de un objeto bytes-like (bytes o mmap).
+        """
+        tramos = []
+        
+        # El primer tramo no va precedido de salto de línea
+        inicial = _PATRON_TRAMO_INICIAL.match(datos)
+        posicion = 0
+        if inicial:
+            tramos.append(inicial.group())
+            posicion = inicial.end() - 1
+        tramos.extend(_PATRON_TRAMO_ATOMOS.findall(datos, posicion))
+        
+        # La última línea puede no terminar en salto de línea
+        if datos[-1:] != b"\n":
+            ultima = datos[datos.rfind(b"\n") + 1:]
+            if ultima[:4] == b"ATOM" or ultima[:6] == b"HETATM":
+                tramos.append(ultima + b"\n")
+        
+        return cls(tramos)
+    
+    @classmethod
+    def desde_texto(cls, molecula):
+        """
+        Construye la tabla a partir de una cadena en formato PDB.
+        
+        La tabla trabaja con columnas de un byte por carácter, así que el
+        texto debe poder codificarse en latin-1. Sustituir los demás
+        caracteres juntaría nombres distintos en uno solo, así que en ese
+        caso se lanza un error (dameResiduos recorre las líneas de texto y
+        no tiene esta limitación).
+        
+        Lanza:
+        - ValueError: Si el texto tiene caracteres fuera de latin-1
+        """
+        try:
+            datos = molecula.encode("latin-1")
+        except UnicodeEncodeError as e:
+            raise ValueError(f"Carácter no representable en latin-1 en la posición {e.start}") from None
+        return cls.desde_datos(datos)
+    
+    @classmethod
+    def desde_fichero(cls, nomfich):
+        """
+        Construye la tabla mapeando el fichero PDB en memoria (mmap), sin
+        leerlo entero a un str.
+        
+        Lanza:
+        - FileNotFoundError: Si el fichero no existe
+        """
+        with open(nomfich, "rb") as f:
+            try:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # No se puede mapear un fichero vacío
+                return cls()
+            with mapa:
+                return cls.desde_datos(mapa)
+    
+    def __len__(self):
+        return self._n
+    
+    def __getattr__(self, campo):
+        # Solo se llama para atributos que no existen: las columnas se
+        # calculan la primera vez que se piden y se guardan como atributo
+        if campo in TablaAtomos._CAMPOS_TEXTO:
+            codigos = self._codigos(campo)
+            ancho = TablaAtomos._CAMPOS_TEXTO[campo][1]
+            traduccion = {codigo: _decodificar(codigo, ancho) for codigo in set(codigos)}
+            valor = list(map(traduccion.__getitem__, codigos))
+        elif campo in TablaAtomos._CAMPOS_NUMERICOS:
+            valor = self._numerica(*TablaAtomos._CAMPOS_NUMERICOS[campo])
+        else:
+            raise AttributeError(campo)
+        setattr(self, campo, valor)
+        return valor
+    
+    def _codigos(self, campo):
+        """
+        Columna de texto como array de códigos enteros de 64 bits: los bytes
+        de cada campo se colocan en un registro de 8 bytes rellenado con ceros
+        y el array se crea directamente sobre esos bytes.
+        """
+        if campo not in self._columnas:
+            inicio, ancho = TablaAtomos._CAMPOS_TEXTO[campo]
+            codigos = array("Q")
+            codigos.frombytes(_extraer_columna(self._bloque, self._ancho, inicio, ancho, 8))
+            self._columnas[campo] = codigos
+        return self._columnas[campo]
+    
+    def _numerica(self, inicio, ancho, tipo):
+        """
+        Columna numérica como array. Los valores se separan con un espacio
+        para poder trocearlos todos con split() (incluso los que ocupan todo
+        el ancho y van pegados al campo anterior) y convertirlos con map().
+        
+        split() solo es válido si cada campo tiene exactamente un valor: un
+        campo vacío y otro con un espacio interno darían también n valores,
+        pero desplazados. Se comprueba que ningún campo está vacío uniendo
+        (OR de enteros grandes) los bytes ocupados de cada carácter del
+        campo; sin campos vacíos, n valores implica uno por campo.
+        """
+        convertir = float if tipo == "d" else int
+        paso = ancho + 1
+        salida = bytes(_extraer_columna(self._bloque, self._ancho, inicio, ancho, paso, b" "))
+        
+        ocupados = 0
+        for k in range(ancho):
+            ocupados |= int.from_bytes(salida[k::paso].translate(_OCUPADO), "big")
+        if ocupados == int.from_bytes(b"\x01" * self._n, "big"):
+            valores = salida.split()
+            if len(valores) == self._n:
+                try:
+                    return array(tipo, map(convertir, valores))
+                except ValueError:
+                    pass
+        
+        # Hay campos vacíos o mal formados: conversión valor a valor
+        invalido = float("nan") if tipo == "d" else 0
+        columna = array(tipo)
+        for i in range(self._n):
+            try:
+                columna.append(convertir(salida[i * paso:(i + 1) * paso]))
+            except ValueError:
+                columna.append(invalido)
+        return columna
+    
+    def _conteo(self, campos):
+        """
+        Cuenta las combinaciones distintas de varios campos de texto.
+        
+        Los campos de cada fila se copian uno tras otro en un registro de
+        longitud fija terminado en salto de línea. Como los campos nunca
+        contienen saltos de línea, cada búsqueda de un registro completo solo
+        puede coincidir con registros enteros: se cuenta el primer registro
+        con bytes.count y se eliminan todas sus apariciones con replace, hasta
+        vaciar el flujo. Así no se crea ningún objeto por átomo y el resultado
+        sale en orden de primera aparición.
+        
+        Retorna:
+        - dict: {bytes de los campos concatenados: número de filas}
+        """
+        anchos = [TablaAtomos._CAMPOS_TEXTO[campo][1] for campo in campos]
+        paso = sum(anchos) + 1
+        flujo = bytearray(b"\n" * (paso * self._n))
+        
+        desplazamiento = 0
+        for campo, ancho in zip(campos, anchos):
+            inicio = TablaAtomos._CAMPOS_TEXTO[campo][0]
+            for k in range(ancho):
+                flujo[desplazamiento + k::paso] = self._bloque[inicio + k::self._ancho]
+            desplazamiento += ancho
+        flujo = bytes(flujo)
+        
+        conteo = {}
+        while flujo:
+            # Con muchos valores distintos es mejor un único recorrido
+            if len(conteo) >= 256:
+                conteo.update(Counter(flujo.split(b"\n")[:-1]))
+                break
+            fila = flujo[:paso]
+            conteo[fila[:-1]] = flujo.count(fila)
+            flujo = flujo.replace(fila, b"")
+        return conteo
+    
+    def _filtro(self, registro):
+        """
+        Máscara (iterador de bool) de los átomos cuyo registro empieza por el
+        indicado, comparando solo los primeros bytes de cada código.
+        """
+        prefijo = registro.encode("latin-1")
+        mascara = (1 << (8 * len(prefijo))) - 1
+        objetivo = int.from_bytes(prefijo, "little")
+        return map(objetivo.__eq__, map(mascara.__and__, self._codigos("registro")))
+    
+    def conteo_residuos(self, registro="ATOM"):
+        """
+        Cuenta los átomos por nombre de residuo, como dameResiduos.
+        
+        Parámetros:
+        - registro (str): Tipo de línea a contar ("ATOM", "HETATM" o "" para todas)
+        
+        Retorna:
+        - dict: {nombre_residuo: número_de_átomos} en orden de aparición
+        """
+        prefijo = registro.encode("latin-1")
+        
+        # Valores distintos pueden dar el mismo nombre sin espacios (" DA" y "DA ")
+        residuos = {}
+        for clave, n in self._conteo(("registro", "residuo")).items():
+            if clave[:6].startswith(prefijo):
+                nombre = clave[6:9].decode("latin-1").strip()
+                residuos[nombre] = residuos.get(nombre, 0) + n
+        return residuos
+    
+    def conteo_por_cadena(self, registro="ATOM"):
+        """
+        Cuenta los átomos por residuo dentro de cada cadena.
+        
+        Retorna:
+        - dict: {cadena: {nombre_residuo: número_de_átomos}}
+        """
+        prefijo = registro.encode("latin-1")
+        
+        por_cadena = {}
+        for clave, n in self._conteo(("registro", "cadena", "residuo")).items():
+            if clave[:6].startswith(prefijo):
+                residuos = por_cadena.setdefault(clave[6:7].decode("latin-1").strip(), {})
+                nombre = clave[7:10].decode("latin-1").strip()
+                residuos[nombre] = residuos.get(nombre, 0) + n
+        return por_cadena
+    
+    def agrupar_por_residuo(self, registro=""):
+        """
+        Agrupa los átomos de cada residuo concreto de la estructura.
+        
+        Los átomos de un residuo van normalmente seguidos. Cada átomo se pasa
+        a un registro de ancho fijo con su clave (prefijo del tipo de línea,
+        cadena, residuo y número) y el flujo de registros se compara consigo
+        mismo desplazado un registro (XOR de enteros grandes) para encontrar
+        dónde cambia la clave. Cada tramo entre dos cambios es un grupo de
+        átomos consecutivos: hay un paso de Python por tramo, no por átomo.
+        
+        Retorna:
+        - dict: {(cadena, num_residuo, nombre_residuo): [índices de átomos]}
+                en orden de aparición
+        """
+        n = self._n
+        if not n:
+            return {}
+        
+        prefijo = registro.encode("latin-1")
+        campos = [
+            (TablaAtomos._CAMPOS_TEXTO["registro"][0], len(prefijo)),
+            TablaAtomos._CAMPOS_TEXTO["cadena"],
+            TablaAtomos._CAMPOS_TEXTO["residuo"],
+            TablaAtomos._CAMPOS_NUMERICOS["num_residuo"][:2],
+        ]
+        paso = sum(ancho for _, ancho in campos)
+        flujo = bytearray(paso * n)
+        desplazamiento = 0
+        for inicio, ancho in campos:
+            for k in range(ancho):
+                flujo[desplazamiento + k::paso] = self._bloque[inicio + k::self._ancho]
+            desplazamiento += ancho
+        flujo = bytes(flujo)
+        
+        # Un registro cambia respecto al anterior si algún byte de su XOR no es 0
+        diferencia = int.from_bytes(flujo[paso:], "big") ^ int.from_bytes(flujo[:-paso], "big")
+        diferencia = diferencia.to_bytes(len(flujo) - paso, "big")
+        cambios = 0
+        for k in range(paso):
+            cambios |= int.from_bytes(diferencia[k::paso].translate(_DISTINTO_DE_CERO), "big")
+        cambios = cambios.to_bytes(n - 1, "big")
+        limites = [0] + [cambio.start() + 1 for cambio in re.finditer(b"\x01", cambios)] + [n]
+        
+        # Los tramos de un mismo residuo que no van seguidos se juntan
+        cadenas, numeros, residuos = self.cadena, self.num_residuo, self.residuo
+        agrupados = {}
+        for inicio, fin in zip(limites, limites[1:]):
+            if flujo.startswith(prefijo, inicio * paso):
+                clave = (cadenas[inicio], numeros[inicio], residuos[inicio])
+                agrupados.setdefault(clave, []).extend(range(inicio, fin))
+        return agrupados
+
+
+# ---------------------------------------------------------------------------
+# Índice espacial por celdas para consultas de vecindad
+# ---------------------------------------------------------------------------
+
+class IndiceEspacial:
+    """
+    Índice espacial (rejilla uniforme de celdas) sobre los átomos de una
+    TablaAtomos, para consultas de vecindad agregadas por residuo.
+    
+    El espacio se divide en cubos de lado tam_celda y cada átomo se guarda
+    en la celda que lo contiene. Una consulta de radio r solo mira las
+    celdas que pueden contener puntos a distancia <= r, en lugar de
+    comparar contra todos los átomos.
+    
+    Parámetros:
+    - tabla (TablaAtomos): Átomos a indexar (se ignoran los de coordenadas NaN)
+    - tam_celda (float): Lado de cada celda en Å (por defecto 4.0)
+    - registro (str): Prefijo del tipo de línea a indexar ("" = ATOM y HETATM)
+    """
+    
+    def __init__(self, tabla, tam_celda=4.0, registro=""):
+        self.tam_celda = tam_celda
+        self.coordenadas = list(zip(tabla.x, tabla.y, tabla.z))
+        
+        # Residuo de cada átomo: índice en self.residuos, clave
+        # (cadena, num_residuo, nombre_residuo) como en agrupar_por_residuo
+        grupos = tabla.agrupar_por_residuo(registro)
+        self.residuos = list(grupos)
+        self.residuo_de_atomo = array("l", [-1]) * len(tabla)
+        for residuo, indices in enumerate(grupos.values()):
+            for indice in indices:
+                self.residuo_de_atomo[indice] = residuo
+        
+        # Rejilla: {(ix, iy, iz): [índices de átomos]}, con la celda de cada
+        # átomo calculada igual que en _celda(). Solo se indexan los átomos
+        # con residuo y sin coordenadas NaN (NaN != NaN)
+        self.celdas = {}
+        for indice, (x, y, z) in enumerate(self.coordenadas):
+            if self.residuo_de_atomo[indice] == -1 or x != x or y != y or z != z:
+                continue
+            celda = (math.floor(x / tam_celda), math.floor(y / tam_celda), math.floor(z / tam_celda))
+            self.celdas.setdefault(celda, []).append(indice)
+        
+        # Caja de celdas ocupadas (mínimos y máximos de ix, iy, iz), para
+        # acotar las capas que recorre k_vecinos
+        if self.celdas:
+            self._caja = tuple((min(eje), max(eje)) for eje in zip(*self.celdas))
+        else:
+            self._caja = None
+    
+    def _celda(self, punto):
+        """Celda (ix, iy, iz) que contiene un punto."""
+        return (math.floor(punto[0] / self.tam_celda),
+                math.floor(punto[1] / self.tam_celda),
+                math.floor(punto[2] / self.tam_celda))
+    
+    def vecinos_radio(self, punto, radio):
+        """
+        Átomos a distancia <= radio de un punto.
+        
+        Retorna:
+        - list: Tuplas (distancia, índice_de_átomo) ordenadas por distancia
+        """
+        cx, cy, cz = self._celda(punto)
+        alcance = math.ceil(radio / self.tam_celda)
+        coordenadas = self.coordenadas
+        encontrados = []
+        
+        for ix in range(cx - alcance, cx + alcance + 1):
+            for iy in range(cy - alcance, cy + alcance + 1):
+                for iz in range(cz - alcance, cz + alcance + 1):
+                    for indice in self.celdas.get((ix, iy, iz), ()):
+                        distancia = math.dist(punto, coordenadas[indice])
+                        if distancia <= radio:
+                            encontrados.append((distancia, indice))
+        
+        encontrados.sort()
+        return encontrados
+    
+    def k_vecinos(self, punto, k):
+        """
+        Los k átomos más cercanos a un punto.
+        
+        Recorre capas de celdas cada vez más alejadas y se detiene cuando la
+        capa siguiente ya no puede contener átomos más cercanos que el
+        k-ésimo encontrado. Las capas se recortan a la caja de celdas
+        ocupadas calculada en __init__, así que una consulta no depende del
+        número total de celdas.
+        
+        Retorna:
+        - list: Tuplas (distancia, índice_de_átomo) ordenadas por distancia
+        """
+        if k <= 0 or not self.celdas:
+            return []
+        
+        centro = self._celda(punto)
+        coordenadas = self.coordenadas
+        mejores = []  # Montículo de máximos con (-distancia, índice)
+        
+        # Capa máxima: la que alcanza la esquina más lejana de la caja
+        capa_maxima = max(max(c - minimo, maximo - c) for c, (minimo, maximo) in zip(centro, self._caja))
+        
+        for capa in range(capa_maxima + 1):
+            if len(mejores) == k and -mejores[0][0] <= self._distancia_a_capa(punto, centro, capa):
+                break
+            for celda in self._celdas_capa(centro, capa):
+                for indice in self.celdas.get(celda, ()):
+                    distancia = math.dist(punto, coordenadas[indice])
+                    if len(mejores) < k:
+                        heapq.heappush(mejores, (-distancia, indice))
+                    elif distancia < -mejores[0][0]:
+                        heapq.heapreplace(mejores, (-distancia, indice))
+        
+        return sorted((-d, indice) for d, indice in mejores)
+    
+    def _distancia_a_capa(self, punto, centro, capa):
+        """
+        Distancia mínima de un punto a cualquier celda de la capa dada (las
+        celdas a distancia de Chebyshev capa de la celda centro): la distancia
+        del punto al borde del cubo formado por las capas anteriores.
+        """
+        tam = self.tam_celda
+        return min(min(p - (c - capa + 1) * tam, (c + capa) * tam - p) for p, c in zip(punto, centro))
+    
+    def _celdas_capa(self, centro, capa):
+        """
+        Genera las celdas del borde de una capa (distancia de Chebyshev capa a
+        la celda centro) que caen dentro de la caja de celdas ocupadas.
+        """
+        cx, cy, cz = centro
+        (x0, x1), (y0, y1), (z0, z1) = self._caja
+        rango_z = range(max(cz - capa, z0), min(cz + capa, z1) + 1)
+        # Solo las dos caras en z, cuando están dentro de la caja
+        caras_z = [iz for iz in (cz - capa, cz + capa) if z0 <= iz <= z1]
+        
+        for ix in range(max(cx - capa, x0), min(cx + capa, x1) + 1):
+            for iy in range(max(cy - capa, y0), min(cy + capa, y1) + 1):
+                # En las caras x e y toda la columna en z es borde
+                if abs(ix - cx) == capa or abs(iy - cy) == capa:
+                    for iz in rango_z:
+                        yield ix, iy, iz
+                else:
+                    for iz in caras_z:
+                        yield ix, iy, iz
+    
+    def residuos_en_radio(self, punto, radio):
+        """
+        Residuos con algún átomo a distancia <= radio de un punto (por
+        ejemplo, los residuos del sitio de unión alrededor de un ligando).
+        
+        Retorna:
+        - dict: {(cadena, num_residuo, nombre_residuo): distancia_mínima}
+                ordenado por distancia
+        """
+        residuos = {}
+        for distancia, indice in self.vecinos_radio(punto, radio):
+            clave = self.residuos[self.residuo_de_atomo[indice]]
+            if clave not in residuos:
+                residuos[clave] = distancia
+        return residuos
+    
+    def residuos_k_vecinos(self, punto, k):
+        """
+        Residuos de los k átomos más cercanos a un punto.
+        
+        Retorna:
+        - dict: {(cadena, num_residuo, nombre_residuo): distancia_mínima}
+        """
+        residuos = {}
+        for distancia, indice in self.k_vecinos(punto, k):
+            clave = self.residuos[self.residuo_de_atomo[indice]]
+            if clave not in residuos:
+                residuos[clave] = distancia
+        return residuos
+    
+    def mapa_contactos(self, corte=4.0):
+        """
+        Pares de residuos distintos con algún par de átomos a distancia <= corte.
+        
+        Los átomos se reparten en columnas de lado corte en (y, z), ordenadas
+        por x. Cada átomo se compara con los que le siguen en su columna y con
+        los de la mitad de las columnas vecinas (4 de 8; la otra mitad ya las
+        compara la columna vecina), y en ambos casos solo con los que caen en
+        la ventana [x - corte, x + corte], localizada con bisect. Así cada par
+        de átomos se prueba una sola vez y hay ~40 % menos candidatos que con
+        la media vecindad de celdas cúbicas.
+        
+        Retorna:
+        - set: Pares (clave_residuo_1, clave_residuo_2), con el residuo que
+               aparece antes en el fichero en primera posición
+        """
+        coordenadas = self.coordenadas
+        residuo_de = self.residuo_de_atomo
+        total = len(self.residuos)
+        lado = corte if corte > 0 else self.tam_celda
+        
+        # Columnas {(iy, iz): [(x, índice), ...]} ordenadas por x
+        columnas = {}
+        for indices in self.celdas.values():
+            for indice in indices:
+                x, y, z = coordenadas[indice]
+                columnas.setdefault((math.floor(y / lado), math.floor(z / lado)), []).append((x, indice))
+        for atomos in columnas.values():
+            atomos.sort()
+        
+        contactos = set()
+        for (iy, iz), propia in columnas.items():
+            # Media vecindad: columnas (iy + dy, iz + dz) con (dy, dz) > (0, 0),
+            # fundidas en una sola franja ordenada por x
+            franja = (columnas.get((iy, iz + 1), []) + columnas.get((iy + 1, iz - 1), [])
+                      + columnas.get((iy + 1, iz), []) + columnas.get((iy + 1, iz + 1), []))
+            franja.sort()
+            
+            xs = [x for x, _ in propia]
+            puntos = [coordenadas[indice] for _, indice in propia]
+            residuos = [residuo_de[indice] for _, indice in propia]
+            xs_franja = [x for x, _ in franja]
+            puntos_franja = [coordenadas[indice] for _, indice in franja]
+            residuos_franja = [residuo_de[indice] for _, indice in franja]
+            
+            for j, x in enumerate(xs):
+                # Ventanas en x: los siguientes de la propia columna y la franja
+                fin = bisect_right(xs, x + corte, j + 1)
+                desde = bisect_left(xs_franja, x - corte)
+                hasta = bisect_right(xs_franja, x + corte)
+                
+                # De los candidatos a <= corte se guarda el par de residuos
+                # codificado como ra * total + rb
+                punto = puntos[j]
+                base = residuos[j] * total
+                contactos.update(base + residuo
+                                 for otro, residuo in zip(puntos[j + 1:fin], residuos[j + 1:fin])
+                                 if math.dist(punto, otro) <= corte)
+                contactos.update(base + residuo
+                                 for otro, residuo in zip(puntos_franja[desde:hasta], residuos_franja[desde:hasta])
+                                 if math.dist(punto, otro) <= corte)
+        
+        # Decodificamos los pares, descartando los de un residuo consigo mismo
+        pares = set()
+        for codigo in contactos:
+            ra, rb = divmod(codigo, total)
+            if ra != rb:
+                pares.add((ra, rb) if ra < rb else (rb, ra))
+        return {(self.residuos[ra], self.residuos[rb]) for ra, rb in pares}
+
+
+# ---------------------------------------------------------------------------
+# Censo de residuos de un directorio completo en paralelo
+# ---------------------------------------------------------------------------
+
+def _censo_fichero(ruta):
+    """
+    Cuenta los residuos (registros ATOM) de un fichero PDB, comprimido con
+    gzip o no. Se ejecuta en los procesos del pool.
+    
+    Retorna:
+    - tuple: (ruta, Counter de residuos o None si hay error, segundos, error)
+    """
+    inicio = time.perf_counter()
+    try:
+        if ruta.endswith(".gz"):
+            with gzip.open(ruta, "rb") as f:
+                tabla = TablaAtomos.desde_datos(f.read())
+        else:
+            tabla = TablaAtomos.desde_fichero(ruta)
+        conteo = Counter(tabla.conteo_residuos())
+        error = None
+    except (OSError, EOFError, zlib.error) as e:
+        conteo = None
+        error = str(e)
+    return ruta, conteo, time.perf_counter() - inicio, error
+
+
+def _reducir_en_arbol(conteos):
+    """
+    Suma una lista de Counter por parejas (reducción en árbol): en cada ronda
+    se suman los contadores de dos en dos hasta que queda uno solo.
+    """
+    conteos = list(conteos)
+    if not conteos:
+        return Counter()
+    while len(conteos) > 1:
+        siguiente = [conteos[i] + conteos[i + 1] for i in range(0, len(conteos) - 1, 2)]
+        if len(conteos) % 2:
+            siguiente.append(conteos[-1])
+        conteos = siguiente
+    return conteos[0]
+
+
+def dameResiduosDirectorio(directorio, procesos=None, extensiones=(".pdb", ".pdb.gz", ".ent", ".ent.gz"),
+                           mostrar_progreso=True):
+    """
+    Cuenta los átomos por residuo de todos los ficheros PDB de un directorio.
+    
+    Los ficheros (también comprimidos con gzip) se reparten entre un pool de
+    procesos; cada uno devuelve su Counter y los contadores se suman con una
+    reducción en árbol. Se informa del progreso y se mide el tiempo de cada
+    fichero.
+    
+    Parámetros:
+    - directorio (str): Directorio a recorrer (incluye subdirectorios)
+    - procesos (int): Número de procesos (None = número de CPUs)
+    - extensiones (tuple): Terminaciones de los ficheros a procesar
+    - mostrar_progreso (bool): Mostrar una línea por fichero procesado
+    
+    Retorna:
+    - tuple: (residuos, tiempos, errores)
+      - residuos (dict): {nombre_residuo: número_de_átomos} de todos los ficheros
+      - tiempos (dict): {ruta: segundos} de cada fichero procesado
+      - errores (dict): {ruta: mensaje} de los ficheros que no se pudieron leer
+    """
+    # Paso 1: reunir los ficheros a procesar
+    rutas = []
+    for raiz, _, ficheros in os.walk(directorio):
+        for nombre in sorted(ficheros):
+            if nombre.endswith(extensiones):
+                rutas.append(os.path.join(raiz, nombre))
+    
+    conteos = []
+    tiempos = {}
+    errores = {}
+    
+    # Paso 2: repartir los ficheros entre los procesos
+    with Pool(procesos) as pool:
+        for hechos, (ruta, conteo, segundos, error) in enumerate(
+                pool.imap_unordered(_censo_fichero, rutas), start=1):
+            tiempos[ruta] = segundos
+            if error is None:
+                conteos.append(conteo)
+            else:
+                errores[ruta] = error
+            if mostrar_progreso:
+                estado = "error" if error else f"{segundos:.3f} s"
+                print(f"[{hechos}/{len(rutas)}] {ruta} ({estado})")
+    
+    # Paso 3: sumar los contadores de todos los ficheros
+    return dict(_reducir_en_arbol(conteos)), tiempos, errores
+
+
+# ---------------------------------------------------------------------------
+# Contador incremental para entrada en streaming (PDB y mmCIF)
+# ---------------------------------------------------------------------------
+
+# Valores de una fila mmCIF: entre comillas simples, dobles o sin espacios
+_PATRON_VALOR_CIF = re.compile(r"""'(.*?)'(?=\s|$)|"(.*?)"(?=\s|$)|(\S+)""")
+
+
+class ContadorResiduos:
+    """
+    Contador incremental de átomos por residuo para texto que llega por trozos.
+    
+    Los trozos se entregan con feed() y pueden cortar las líneas en cualquier
+    punto: la última línea incompleta se guarda hasta el siguiente trozo.
+    Acepta formato PDB (líneas ATOM, como dameResiduos) y mmCIF (bucles
+    loop_ de _atom_site, contando las filas ATOM por _atom_site.label_comp_id).
+    
+    Uso:
+        contador = ContadorResiduos()
+        for trozo in trozos:
+            contador.feed(trozo)
+            print(contador.result())   # Estadísticas en vivo
+        residuos = contador.finalizar()
+    """
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Vuelve al estado inicial, descartando los conteos."""
+        self._residuos = {}
+        self._resto = ""
+        self._decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # Estado del analizador mmCIF
+        self._estado = None         # None, "cabecera", "atom_site" u "otro"
+        self._columnas = []         # Columnas del bucle que se está leyendo
+        self._valores = []          # Valores de una fila partida en varias líneas
+        self._col_grupo = None      # Índice de _atom_site.group_PDB
+        self._col_residuo = None    # Índice de _atom_site.label_comp_id
+    
+    def snapshot(self):
+        """
+        Copia independiente del contador en su estado actual (conteos y
+        línea pendiente), para seguir alimentando una y otra por separado.
+        """
+        copia = ContadorResiduos.__new__(ContadorResiduos)
+        copia.__dict__.update(self.__dict__)
+        copia._residuos = dict(self._residuos)
+        copia._columnas = list(self._columnas)
+        copia._valores = list(self._valores)
+        copia._decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        copia._decodificador.setstate(self._decodificador.getstate())
+        return copia
+    
+    def feed(self, trozo):
+        """
+        Procesa un trozo de texto (str) o de bytes (UTF-8).
+        Los caracteres multibyte partidos entre trozos se recomponen.
+        """
+        if not isinstance(trozo, str):
+            trozo = self._decodificador.decode(trozo)
+        
+        lineas = (self._resto + trozo).split("\n")
+        # El último elemento es una línea incompleta (o vacío)
+        self._resto = lineas.pop()
+        for linea in lineas:
+            self._procesar_linea(linea)
+    
+    def result(self):
+        """
+        Conteo actual {nombre_residuo: número_de_átomos} de las líneas
+        completas recibidas hasta ahora (copia, se puede modificar).
+        """
+        return dict(self._residuos)
+    
+    def finalizar(self):
+        """
+        Procesa la última línea aunque no termine en salto de línea y
+        devuelve el conteo final.
+        """
+        self._resto += self._decodificador.decode(b"", final=True)
+        if self._resto:
+            self._procesar_linea(self._resto)
+            self._resto = ""
+        return self.result()
+    
+    def _contar(self, nombre_residuo):
+        self._residuos[nombre_residuo] = self._residuos.get(nombre_residuo, 0) + 1
+    
+    def _procesar_linea(self, linea):
+        """Aplica una línea completa al estado del contador."""
+        inicio = linea.lstrip()
+        
+        # --- mmCIF: inicio de un bucle y lectura de sus columnas ---
+        if inicio.startswith("loop_"):
+            self._estado = "cabecera"
+            self._columnas = []
+            self._valores = []
+            return
+        
+        if self._estado == "cabecera":
+            if inicio.startswith("_"):
+                self._columnas.append(inicio.split()[0])
+                return
+            if self._columnas and self._columnas[0].startswith("_atom_site."):
+                self._empezar_atom_site()
+            else:
+                self._estado = "otro"
+        
+        if self._estado in ("atom_site", "otro"):
+            # El bucle termina con otra sección, un comentario o un bloque nuevo
+            if not inicio or inicio.startswith(("_", "#", "data_")):
+                self._estado = None
+            elif self._estado == "atom_site":
+                self._procesar_fila_cif(inicio)
+                return
+            else:
+                return
+        
+        # --- PDB: como en dameResiduos ---
+        if linea.startswith("ATOM"):
+            self._contar(linea[17:20].strip())
+    
+    def _empezar_atom_site(self):
+        """Localiza las columnas necesarias del bucle _atom_site."""
+        self._estado = "atom_site"
+        nombres = [columna[len("_atom_site."):] for columna in self._columnas]
+        self._col_grupo = nombres.index("group_PDB") if "group_PDB" in nombres else None
+        for campo in ("label_comp_id", "auth_comp_id"):
+            if campo in nombres:
+                self._col_residuo = nombres.index(campo)
+                break
+        else:
+            # Sin columna de residuo no hay nada que contar en este bucle
+            self._estado = "otro"
+    
+    def _procesar_fila_cif(self, linea):
+        """Añade los valores de una línea y cuenta cada fila completa."""
+        for simple, doble, normal in _PATRON_VALOR_CIF.findall(linea):
+            self._valores.append(simple or doble or normal)
+        
+        columnas = len(self._columnas)
+        while len(self._valores) >= columnas:
+            fila = self._valores[:columnas]
+            del self._valores[:columnas]
+            if self._col_grupo is None or fila[self._col_grupo] == "ATOM":
+                self._contar(fila[self._col_residuo])
+
+
+def contarResiduosEntrada(flujo=None, tam_trozo=1 << 16, cada=0):
+    """
+    Cuenta los residuos de un PDB/mmCIF leído de un flujo (por defecto la
+    entrada estándar) sin cargarlo entero.
+    
+    Parámetros:
+    - flujo: Objeto con read() que devuelve bytes o str (None = stdin)
+    - tam_trozo (int): Tamaño de cada lectura
+    - cada (int): Si es > 0, muestra el conteo parcial cada 'cada' trozos
+    
+    Retorna:
+    - dict: {nombre_residuo: número_de_átomos}
+    """
+    if flujo is None:
+        flujo = sys.stdin.buffer
+    
+    contador = ContadorResiduos()
+    leidos = 0
+    while True:
+        trozo = flujo.read(tam_trozo)
+        if not trozo:
+            break
+        contador.feed(trozo)
+        leidos += 1
+        if cada and leidos % cada == 0:
+            print(f"Parcial tras {leidos} trozos: {contador.result()}")
+    
+    return contador.finalizar()
+
+
 # Código de prueba proporcionado
 molecula = """
 ATOM      1  N   HIS A   1      49.668  24.248  10.436  1.00 25.00           N
@@ -122,4 +1171,66 @@ if __name__ == "__main__":
     print(f"Total de residuos diferentes: {len(resultado)}")
     print(f"Total de átomos: {sum(resultado.values())}")
     for residuo, num_atomos in resultado.items():
-        print(f"  {residuo}: {num_atomos} átomos")
\ No newline at end of file
+        print(f"  {residuo}: {num_atomos} átomos")
+    
+    # Versión por fichero
+    print("\n=== Verificando versión por fichero ===")
+    import tempfile
+    fichero_pdb = os.path.join(tempfile.gettempdir(), "prueba_residuos.pdb")
+    with open(fichero_pdb, "w") as f:
+        f.write(molecula)
+    print(f"dameResiduosFichero(fichero_pdb) = {dameResiduosFichero(fichero_pdb)}")  # Esperado: {'HIS': 10, 'SER': 6, 'GLN': 3}
+    fichero_raro = os.path.join(tempfile.gettempdir(), "prueba_residuos_raros.pdb")
+    with open(fichero_raro, "w") as f:
+        f.write("ATOM      1  N   ÑÑÑ A   1      11.104   6.134  -6.504  1.00  0.00           N\n"
+                "ATOM      2  N   H\tS A   2      11.104   6.134  -6.504  1.00  0.00           N\n")
+    with open(fichero_raro) as f:
+        print(f"Nombres no ASCII y tabuladores: {dameResiduosFichero(fichero_raro) == dameResiduos(f.read())}")  # Esperado: True
+    
+    # Tabla columnar de átomos
+    print("\n=== Verificando tabla de átomos ===")
+    tabla = TablaAtomos.desde_fichero(fichero_pdb)
+    print(f"Átomos leídos: {len(tabla)}")  # Esperado: 19
+    print(f"Primer átomo: {tabla.nombre[0]} {tabla.residuo[0]} ({tabla.x[0]}, {tabla.y[0]}, {tabla.z[0]})")
+    print(f"Conteo por cadena: {tabla.conteo_por_cadena()}")  # Esperado: {'A': {'HIS': 10, 'SER': 6, 'GLN': 3}}
+    print(f"Residuos: {[(clave, len(atomos)) for clave, atomos in tabla.agrupar_por_residuo().items()]}")
+    
+    # Censo de un directorio
+    print("\n=== Verificando censo de directorio ===")
+    directorio_pdb = tempfile.mkdtemp()
+    with open(os.path.join(directorio_pdb, "uno.pdb"), "w") as f:
+        f.write(molecula)
+    with gzip.open(os.path.join(directorio_pdb, "dos.pdb.gz"), "wt") as f:
+        f.write(molecula)
+    residuos, tiempos, errores = dameResiduosDirectorio(directorio_pdb, procesos=2)
+    print(f"Residuos: {residuos}")  # Esperado: {'HIS': 20, 'SER': 12, 'GLN': 6}
+    
+    # Índice espacial
+    print("\n=== Verificando índice espacial ===")
+    indice = IndiceEspacial(tabla)
+    print(f"Contactos a 4 Å: {sorted(indice.mapa_contactos(4.0))}")
+    # Esperado: [(('A', 1, 'HIS'), ('A', 2, 'SER')), (('A', 1, 'HIS'), ('A', 3, 'GLN')), (('A', 2, 'SER'), ('A', 3, 'GLN'))]
+    print(f"Residuos a 5 Å del átomo 0: {indice.residuos_en_radio(indice.coordenadas[0], 5.0)}")
+    print(f"3 vecinos más cercanos del átomo 0: {indice.k_vecinos(indice.coordenadas[0], 3)}")
+    
+    # Contador incremental (PDB y mmCIF)
+    print("\n=== Verificando contador incremental ===")
+    contador = ContadorResiduos()
+    for i in range(0, len(molecula), 100):
+        contador.feed(molecula[i:i + 100])
+    print(f"PDB por trozos: {contador.finalizar()}")  # Esperado: {'HIS': 10, 'SER': 6, 'GLN': 3}
+    cif = """data_prueba
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+ATOM 1 N MET
+ATOM 2 CA MET
+HETATM 3 O HOH
+ATOM 4 "C1'" DA
+#
+"""
+    contador.reset()
+    contador.feed(cif.encode())
+    print(f"mmCIF: {contador.finalizar()}")  # Esperado: {'MET': 2, 'DA': 1}
\ No newline at end of file
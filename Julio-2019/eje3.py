@@ -1,6 +1,29 @@
 # Apellidos, Nombre: [Tu nombre aquí]
 
-def calculaPorcentajesGC(nomfich):
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate, islice, repeat
+from math import gcd
+from multiprocessing import Pool
+
+from composicion import composicionNucleotidos
+from lectura_fasta import eventos_fasta as _eventos_fasta
+
+
+def calculaPorcentajesGC(nomfich, modo="lineas", salida="salida.gc", formato="texto"):
     """
     Lee un archivo FASTA y calcula el porcentaje de GC para cada secuencia.
     También crea un archivo de salida con los resultados.
@@ -12,15 +35,21 @@ def calculaPorcentajesGC(nomfich):
     Formato FASTA:
     - Las líneas que empiezan con '>' son cabeceras
     - Las siguientes líneas (hasta la próxima cabecera) forman la secuencia
+    - El fichero puede estar comprimido con gzip, bgzip, xz o bzip2 (ver abreFasta)
     
     Parámetros:
     - nomfich (str): Nombre del archivo FASTA a procesar
+    - modo (str): "lineas" (construye cada secuencia), "streaming" (solo
+                  lleva contadores, ver calculaPorcentajesGC_streaming) o
+                  "paralelo" (ver calculaPorcentajesGC_paralelo)
+    - salida (str): Fichero de resultados
+    - formato (str): "texto", "gzip" o "binario" (ver EscritorGC)
     
     Retorna:
     - list: Lista de porcentajes GC redondeados a 2 decimales
     
     También crea:
-    - salida.gc: Archivo con cabeceras y porcentajes GC
+    - salida.gc (o el fichero indicado): Archivo con cabeceras y porcentajes GC
     
     Pseudocódigo:
     1. Abrir archivo de entrada y salida
@@ -35,11 +64,17 @@ def calculaPorcentajesGC(nomfich):
     5. Devolver lista de porcentajes
     """
     
+    # Modo streaming: sin construir las secuencias en memoria
+    if modo == "streaming":
+        return calculaPorcentajesGC_streaming(nomfich, salida=salida, formato=formato)
+    if modo == "paralelo":
+        return calculaPorcentajesGC_paralelo(nomfich, salida=salida, formato=formato)
+    
     porcentajes = []  # Lista para almacenar los porcentajes GC
     
     try:
         # Abrir archivos de entrada y salida
-        with open(nomfich, 'r') as f_entrada, open('salida.gc', 'w') as f_salida:
+        with abreFasta(nomfich, 'r') as f_entrada, EscritorGC(salida, formato) as f_salida:
             
             cabecera_actual = ""  # Almacena la cabecera actual
             secuencia_actual = ""  # Almacena la secuencia que se está construyendo
@@ -57,9 +92,8 @@ def calculaPorcentajesGC(nomfich):
                         porcentaje = calcular_porcentaje_gc(secuencia_actual)
                         porcentajes.append(porcentaje)
                         
-                        # Escribir en archivo de salida
-                        f_salida.write(cabecera_actual)  # Ya incluye \n
-                        f_salida.write(f"{porcentaje}\n")
+                        # Escribir en archivo de salida (sin el '>' ni el \n)
+                        f_salida.escribir(cabecera_actual[1:].rstrip("\n"), porcentaje)
                     
                     # Guardar nueva cabecera y reiniciar secuencia
                     cabecera_actual = linea
@@ -74,8 +108,7 @@ def calculaPorcentajesGC(nomfich):
             if cabecera_actual and secuencia_actual:
                 porcentaje = calcular_porcentaje_gc(secuencia_actual)
                 porcentajes.append(porcentaje)
-                f_salida.write(cabecera_actual)
-                f_salida.write(f"{porcentaje}\n")
+                f_salida.escribir(cabecera_actual[1:].rstrip("\n"), porcentaje)
                 
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {nomfich}")
@@ -100,25 +133,23 @@ def calcular_porcentaje_gc(secuencia):
     if len(secuencia) == 0:
         return 0.0
     
-    # Contar G y C (mayúsculas y minúsculas por si acaso)
-    num_g = secuencia.upper().count('G')
-    num_c = secuencia.upper().count('C')
-    
-    # Calcular porcentaje
-    porcentaje = (num_g + num_c) / len(secuencia)
+    # Contar G y C (mayúsculas y minúsculas por si acaso) con el motor de
+    # composición, en una sola pasada que no copia la secuencia a mayúsculas
+    porcentaje = composicionNucleotidos(secuencia).fraccion_gc()
     
     # Redondear a 2 decimales
     return round(porcentaje, 2)
 
 
 # Versión alternativa más compacta
-def calculaPorcentajesGC_v2(nomfich):
+def calculaPorcentajesGC_v2(nomfich, salida="salida.gc", formato="texto"):
     """
     Versión alternativa usando un enfoque más funcional.
+    La salida se escribe con EscritorGC (ver calculaPorcentajesGC).
     """
     porcentajes = []
     
-    with open(nomfich, 'r') as f_in, open('salida.gc', 'w') as f_out:
+    with abreFasta(nomfich, 'r') as f_in, EscritorGC(salida, formato) as f_out:
         contenido = f_in.read()
         
         # Dividir por cabeceras (cada elemento empieza con >)
@@ -126,19 +157,1018 @@ def calculaPorcentajesGC_v2(nomfich):
         
         for bloque in bloques:
             lineas = bloque.strip().split('\n')
-            cabecera = '>' + lineas[0] + '\n'  # Reconstruir cabecera con >
+            cabecera = lineas[0]                # Cabecera sin el >
             secuencia = ''.join(lineas[1:])     # Unir todas las líneas de secuencia
             
             # Calcular porcentaje GC
-            gc_count = secuencia.upper().count('G') + secuencia.upper().count('C')
-            porcentaje = round(gc_count / len(secuencia), 2) if secuencia else 0.0
+            porcentaje = calcular_porcentaje_gc(secuencia)
             
             porcentajes.append(porcentaje)
-            f_out.write(f"{cabecera}{porcentaje}\n")
+            f_out.escribir(cabecera, porcentaje)
     
     return porcentajes
 
 
+# ---------------------------------------------------------------------------
+# Escritura de salida.gc por lotes
+# ---------------------------------------------------------------------------
+
+# Cabecera del formato binario por columnas
+_MAGICO_GC_BINARIO = b"GCC1"
+
+
+class _TextosPorcentaje(dict):
+    """
+    Caché del texto de cada porcentaje (b"0.52\n"). Los porcentajes vienen
+    redondeados a 2 decimales, así que hay muy pocos valores distintos y
+    pasar cada float a texto es lo más caro de escribir la salida.
+    """
+    
+    def __missing__(self, porcentaje):
+        texto = self[porcentaje] = f"{porcentaje}\n".encode()
+        return texto
+
+
+class EscritorGC:
+    """
+    Escribe los resultados (cabecera, porcentaje) acumulándolos en memoria
+    y volcándolos en bloques grandes, en lugar de hacer dos write() por
+    registro. El formateo también se hace por lotes, al volcar.
+    
+    Formatos:
+    - "texto": el formato de salida.gc (">cabecera\\nporcentaje\\n")
+    - "gzip": el mismo texto comprimido con gzip
+    - "binario": por columnas, para leer de golpe con leeSalidaGC_binaria:
+        b"GCC1" | n (uint64) | n porcentajes (float64) |
+        n finales de cabecera (uint64) | cabeceras concatenadas
+      (enteros y reales en little-endian)
+    
+    Ejemplo:
+        with EscritorGC("salida.gc.gz", formato="gzip") as escritor:
+            escritor.escribir("chr1", 0.41)
+    """
+    
+    FORMATOS = ("texto", "gzip", "binario")
+    
+    def __init__(self, salida="salida.gc", formato="texto", registros_lote=1 << 16):
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato desconocido: {formato} (válidos: {', '.join(self.FORMATOS)})")
+        self.formato = formato
+        self.registros_lote = registros_lote
+        self.lote_cabeceras = []
+        self.lote_porcentajes = []
+        self.textos = _TextosPorcentaje()
+        
+        if formato == "gzip":
+            self.fichero = gzip.open(salida, 'wb')
+        else:
+            self.fichero = open(salida, 'wb')
+        
+        if formato == "binario":
+            # Las columnas numéricas son pequeñas y se guardan en memoria; las
+            # cabeceras se van volcando a un temporal hasta cerrar el fichero
+            self.porcentajes = array('d')
+            self.finales = array('Q')
+            self.cabeceras = tempfile.TemporaryFile()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+    
+    def escribir(self, cabecera, porcentaje):
+        """
+        Añade un registro.
+        
+        Parámetros:
+        - cabecera (str o bytes): Cabecera sin '>' ni salto de línea
+        - porcentaje (float): Porcentaje GC del registro
+        """
+        self.lote_cabeceras.append(cabecera)
+        self.lote_porcentajes.append(porcentaje)
+        if len(self.lote_cabeceras) >= self.registros_lote:
+            self.volcar()
+    
+    def volcar(self):
+        """Formatea y escribe de una vez los registros acumulados."""
+        if not self.lote_cabeceras:
+            return
+        cabeceras = self.lote_cabeceras
+        if not all(isinstance(c, bytes) for c in cabeceras):
+            cabeceras = [c.encode() if isinstance(c, str) else c for c in cabeceras]
+        
+        if self.formato == "binario":
+            self.porcentajes.extend(self.lote_porcentajes)
+            inicial = self.finales[-1] if self.finales else 0
+            self.finales.extend(islice(accumulate(map(len, cabeceras), initial=inicial), 1, None))
+            self.cabeceras.write(b"".join(cabeceras))
+        else:
+            textos = map(self.textos.__getitem__, self.lote_porcentajes)
+            self.fichero.write(b"".join(map(b"".join, zip(repeat(b">"), cabeceras, repeat(b"\n"), textos))))
+            if len(self.textos) > 4096:
+                # Porcentajes sin redondear: la caché no sirve, no dejamos que crezca
+                self.textos.clear()
+        
+        self.lote_cabeceras = []
+        self.lote_porcentajes = []
+    
+    def cerrar(self):
+        """Vuelca lo pendiente y cierra el fichero (en binario, lo compone)."""
+        if self.fichero.closed:
+            return
+        self.volcar()
+        
+        if self.formato == "binario":
+            porcentajes, finales = self.porcentajes, self.finales
+            if sys.byteorder == "big":
+                porcentajes.byteswap()
+                finales.byteswap()
+            self.fichero.write(_MAGICO_GC_BINARIO)
+            self.fichero.write(len(porcentajes).to_bytes(8, "little"))
+            self.fichero.write(porcentajes.tobytes())
+            self.fichero.write(finales.tobytes())
+            self.cabeceras.seek(0)
+            shutil.copyfileobj(self.cabeceras, self.fichero)
+            self.cabeceras.close()
+        
+        self.fichero.close()
+
+
+def leeSalidaGC_binaria(fichero):
+    """
+    Lee un fichero escrito por EscritorGC con formato="binario".
+    
+    Parámetros:
+    - fichero (str): Nombre del fichero
+    
+    Retorna:
+    - tuple: (lista de cabeceras, array('d') de porcentajes)
+    """
+    with open(fichero, 'rb') as f:
+        datos = f.read()
+    if datos[:4] != _MAGICO_GC_BINARIO:
+        raise ValueError(f"{fichero} no es un fichero GC binario")
+    
+    n = int.from_bytes(datos[4:12], "little")
+    porcentajes = array('d', datos[12:12 + 8 * n])
+    finales = array('Q', datos[12 + 8 * n:12 + 16 * n])
+    if sys.byteorder == "big":
+        porcentajes.byteswap()
+        finales.byteswap()
+    
+    cabeceras = datos[12 + 16 * n:]
+    inicios = [0, *finales[:-1]]
+    return [cabeceras[i:j].decode(errors="replace") for i, j in zip(inicios, finales)], porcentajes
+
+
+# ---------------------------------------------------------------------------
+# Entrada comprimida (gzip, bgzip, xz, bzip2)
+# ---------------------------------------------------------------------------
+
+# Funciones para abrir cada formato comprimido en modo binario
+_ABRIR_COMPRIMIDO = {"gzip": gzip.open, "xz": lzma.open, "bz2": bz2.open}
+
+
+def _detecta_compresion(nomfich):
+    """
+    Detecta la compresión de un fichero por sus primeros bytes (números mágicos).
+    
+    Retorna:
+    - str: "gzip", "bgzip", "xz", "bz2" o None si no está comprimido
+    """
+    with open(nomfich, 'rb') as f:
+        cabecera = f.read(18)
+    
+    if cabecera[:2] == b"\x1f\x8b":
+        # bgzip es gzip por bloques con el subcampo extra "BC" (tamaño del bloque)
+        if len(cabecera) == 18 and cabecera[3] & 4 and cabecera[12:14] == b"BC":
+            return "bgzip"
+        return "gzip"
+    if cabecera[:6] == b"\xfd7zXZ\x00":
+        return "xz"
+    if cabecera[:3] == b"BZh":
+        return "bz2"
+    return None
+
+
+def _bloques_bgzf(mapa):
+    """
+    Genera (inicio, inicio_datos, fin) de cada bloque BGZF de un fichero
+    bgzip mapeado en memoria, saltando de bloque en bloque con su tamaño;
+    los datos comprimidos ocupan [inicio_datos, fin - 8).
+    """
+    posicion = 0
+    while posicion < len(mapa):
+        if mapa[posicion:posicion + 2] != b"\x1f\x8b" or not mapa[posicion + 3] & 4:
+            raise ValueError(f"Bloque BGZF no válido en el byte {posicion}")
+        
+        # Buscamos el subcampo BC entre los campos extra de la cabecera gzip
+        fin_extra = posicion + 12 + int.from_bytes(mapa[posicion + 10:posicion + 12], "little")
+        campo = posicion + 12
+        tam_bloque = None
+        while campo + 4 <= fin_extra:
+            longitud = int.from_bytes(mapa[campo + 2:campo + 4], "little")
+            if mapa[campo:campo + 2] == b"BC" and longitud == 2:
+                tam_bloque = int.from_bytes(mapa[campo + 4:campo + 6], "little") + 1
+            campo += 4 + longitud
+        if tam_bloque is None:
+            raise ValueError(f"Bloque gzip sin subcampo BC en el byte {posicion}")
+        
+        yield posicion, fin_extra, posicion + tam_bloque
+        posicion += tam_bloque
+
+
+def _descomprime_bloques(mapa, bloques):
+    """
+    Descomprime un grupo de bloques BGZF y comprueba su CRC.
+    zlib libera el GIL, así que varios hilos descomprimen a la vez.
+    """
+    partes = []
+    for inicio, datos, fin in bloques:
+        final = mapa[fin - 8:fin]
+        parte = zlib.decompress(mapa[datos:fin - 8], -15)
+        if (zlib.crc32(parte).to_bytes(4, "little") != final[:4]
+                or len(parte) != int.from_bytes(final[4:], "little")):
+            raise ValueError(f"CRC incorrecto en el bloque BGZF del byte {inicio}")
+        partes.append(parte)
+    return b"".join(partes)
+
+
+def _trozos_bgzf(nomfich, hilos=None, bloques_tarea=64):
+    """
+    Genera el contenido descomprimido de un fichero bgzip, en orden,
+    descomprimiendo grupos de bloques en paralelo con un pool de hilos.
+    Como mucho hay 2 grupos por hilo pendientes, para acotar la memoria.
+    """
+    hilos = hilos or os.cpu_count() or 1
+    with open(nomfich, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa, \
+            ThreadPoolExecutor(hilos) as ejecutor:
+        pendientes = deque()
+        bloques = _bloques_bgzf(mapa)
+        while True:
+            grupo = list(islice(bloques, bloques_tarea))
+            if not grupo:
+                break
+            pendientes.append(ejecutor.submit(_descomprime_bloques, mapa, grupo))
+            if len(pendientes) >= 2 * hilos:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def _trozos_fichero(abrir, nomfich, tam_trozo=1 << 20):
+    """Genera el contenido de un fichero comprimido por trozos."""
+    with abrir(nomfich, 'rb') as f:
+        while True:
+            trozo = f.read(tam_trozo)
+            if not trozo:
+                break
+            yield trozo
+
+
+class _LectorHilo(io.RawIOBase):
+    """
+    Fichero de solo lectura cuyo contenido produce un hilo en segundo plano.
+    
+    El hilo recorre un generador de trozos (normalmente, descomprimiendo) y
+    los deja en una cola acotada; read() los va sacando. Así la
+    descompresión se solapa con el cálculo, y la cola limita la memoria si
+    el consumidor es más lento. Los errores del hilo se relanzan en read().
+    """
+    
+    def __init__(self, trozos, tam_cola=8):
+        super().__init__()
+        self._cola = queue.Queue(tam_cola)
+        self._parar = threading.Event()
+        self._trozo = b""
+        self._posicion = 0
+        self._terminado = False
+        self._hilo = threading.Thread(target=self._producir, args=(trozos,), daemon=True)
+        self._hilo.start()
+    
+    def _poner(self, elemento):
+        # Esperamos hueco en la cola salvo que se haya cerrado el lector
+        while not self._parar.is_set():
+            try:
+                self._cola.put(elemento, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def _producir(self, trozos):
+        try:
+            for trozo in trozos:
+                if trozo and not self._poner(trozo):
+                    return
+            self._poner(None)
+        except BaseException as e:
+            self._poner(e)
+        finally:
+            trozos.close()
+    
+    def readable(self):
+        return True
+    
+    def read(self, n=-1):
+        if n is None or n < 0:
+            return self.readall()
+        if self._posicion >= len(self._trozo):
+            if self._terminado:
+                return b""
+            elemento = self._cola.get()
+            if elemento is None or isinstance(elemento, BaseException):
+                self._terminado = True
+                if elemento is None:
+                    return b""
+                raise elemento
+            self._trozo, self._posicion = elemento, 0
+        
+        if self._posicion == 0 and n >= len(self._trozo):
+            # Trozo entero: se entrega sin copiarlo
+            datos = self._trozo
+        else:
+            datos = self._trozo[self._posicion:self._posicion + n]
+        self._posicion += len(datos)
+        return datos
+    
+    def readinto(self, b):
+        datos = self.read(len(b))
+        b[:len(datos)] = datos
+        return len(datos)
+    
+    def close(self):
+        self._parar.set()
+        super().close()
+
+
+def abreFasta(nomfich, modo='rb', hilos=None, tam_cola=8):
+    """
+    Abre un FASTA, comprimido o no, detectando la compresión por sus
+    primeros bytes (no por la extensión).
+    
+    Si está comprimido, un hilo lo descomprime en segundo plano y deja los
+    trozos en una cola acotada, de modo que la descompresión se solapa con
+    el cálculo. Los ficheros bgzip se descomprimen además por bloques en
+    paralelo con 'hilos' hilos.
+    
+    Parámetros:
+    - nomfich (str): Nombre del archivo
+    - modo (str): 'rb' (bytes) o 'r' (texto, como open)
+    - hilos (int): Hilos para descomprimir bgzip (None = número de CPUs)
+    - tam_cola (int): Trozos descomprimidos que pueden esperar en la cola
+    
+    Retorna:
+    - Objeto fichero de lectura, utilizable con 'with'
+    """
+    compresion = _detecta_compresion(nomfich)
+    if compresion is None:
+        return open(nomfich, modo)
+    
+    if compresion == "bgzip":
+        trozos = _trozos_bgzf(nomfich, hilos)
+    else:
+        trozos = _trozos_fichero(_ABRIR_COMPRIMIDO[compresion], nomfich)
+    lector = _LectorHilo(trozos, tam_cola)
+    
+    if 'b' in modo:
+        return lector
+    return io.TextIOWrapper(io.BufferedReader(lector))
+
+
+# ---------------------------------------------------------------------------
+# Lectura de FASTA en streaming (por trozos binarios)
+# ---------------------------------------------------------------------------
+
+# Bases G y C en mayúsculas y minúsculas: al borrarlas con translate, la
+# diferencia de longitudes es el número de G/C sin distinguir mayúsculas
+_BASES_GC = b"GCgc"
+
+
+def _contar_gc(datos):
+    """Número de G/C (sin distinguir mayúsculas) en un trozo de bytes."""
+    return len(datos) - len(datos.translate(None, _BASES_GC))
+
+
+def _gc_registros(f, tam_trozo=1 << 20):
+    """
+    Calcula el porcentaje GC de cada registro de un FASTA binario sin
+    construir las secuencias: para el registro actual solo se llevan dos
+    contadores (G+C y total de bases) que se actualizan con cada trozo.
+    
+    Genera:
+    - tuple: (cabecera sin '>', porcentaje) de cada registro con secuencia
+             (igual que la versión original, sin secuencia no hay resultado)
+    """
+    cabecera = None   # Cabecera del registro actual
+    num_gc = 0        # G y C vistas en el registro actual
+    total = 0         # Bases vistas en el registro actual
+    
+    for tipo, datos in _eventos_fasta(f, tam_trozo):
+        if tipo == "cabecera":
+            if cabecera is not None and total:
+                yield cabecera, round(num_gc / total, 2)
+            cabecera = datos
+            num_gc = 0
+            total = 0
+        else:
+            total += len(datos)
+            num_gc += _contar_gc(datos)
+    
+    if cabecera is not None and total:
+        yield cabecera, round(num_gc / total, 2)
+
+
+def calculaPorcentajesGC_streaming(nomfich, tam_trozo=1 << 20, salida="salida.gc", formato="texto"):
+    """
+    Versión en streaming de calculaPorcentajesGC.
+    
+    Nunca construye las secuencias: lee el fichero en binario por trozos y
+    mantiene para el registro actual dos contadores (G+C y total de bases)
+    que se actualizan con cada trozo. La memoria usada es constante, sea
+    cual sea la longitud de las secuencias.
+    
+    Devuelve la misma lista y escribe el mismo salida.gc que calculaPorcentajesGC.
+    
+    Parámetros:
+    - nomfich (str): Nombre del archivo FASTA a procesar
+    - tam_trozo (int): Bytes leídos en cada lectura
+    - salida (str): Fichero de resultados
+    - formato (str): "texto", "gzip" o "binario" (ver EscritorGC)
+    
+    Retorna:
+    - list: Lista de porcentajes GC redondeados a 2 decimales
+    """
+    porcentajes = []
+    
+    try:
+        with abreFasta(nomfich) as f_entrada, EscritorGC(salida, formato) as f_salida:
+            for cabecera, porcentaje in _gc_registros(f_entrada, tam_trozo):
+                porcentajes.append(porcentaje)
+                f_salida.escribir(cabecera, porcentaje)
+    
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {nomfich}")
+        return []
+    except Exception as e:
+        print(f"Error procesando archivo: {e}")
+        return []
+    
+    return porcentajes
+
+
+# ---------------------------------------------------------------------------
+# Cálculo en paralelo dividiendo el fichero por registros
+# ---------------------------------------------------------------------------
+
+class _LectorRango:
+    """
+    Objeto con read() sobre el rango [inicio, fin) de un fichero mapeado en
+    memoria, para reutilizar _eventos_fasta sobre una parte del fichero.
+    """
+    
+    def __init__(self, mapa, inicio, fin):
+        self.mapa = mapa
+        self.posicion = inicio
+        self.fin = fin
+    
+    def read(self, n):
+        datos = self.mapa[self.posicion:min(self.posicion + n, self.fin)]
+        self.posicion += len(datos)
+        return datos
+
+
+def _rangos_registros(mapa, partes):
+    """
+    Divide un FASTA mapeado en memoria en rangos de bytes de tamaño parecido
+    que empiezan siempre en una cabecera ('>' a principio de línea), de modo
+    que ningún registro queda repartido entre dos rangos.
+    
+    Parámetros:
+    - mapa (mmap): Fichero mapeado en memoria
+    - partes (int): Número de rangos deseado (puede haber menos)
+    
+    Retorna:
+    - list: Tuplas (inicio, fin) consecutivas que cubren todo el fichero
+    """
+    tamano = len(mapa)
+    cortes = [0]
+    for parte in range(1, partes):
+        objetivo = max(tamano * parte // partes, cortes[-1])
+        posicion = mapa.find(b"\n>", objetivo)
+        if posicion == -1:
+            break
+        # El rango siguiente empieza en el '>'
+        if posicion + 1 > cortes[-1]:
+            cortes.append(posicion + 1)
+    cortes.append(tamano)
+    return list(zip(cortes[:-1], cortes[1:]))
+
+
+def _gc_rango(tarea):
+    """
+    Calcula los porcentajes GC de los registros de un rango de bytes.
+    Se ejecuta en los procesos del pool; cada uno mapea el fichero por su cuenta.
+    """
+    nomfich, inicio, fin, tam_trozo = tarea
+    with open(nomfich, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            return list(_gc_registros(_LectorRango(mapa, inicio, fin), tam_trozo))
+
+
+def calculaPorcentajesGC_paralelo(nomfich, procesos=None, partes=None, tam_trozo=1 << 20,
+                                  salida="salida.gc", formato="texto"):
+    """
+    Versión en paralelo de calculaPorcentajesGC para ficheros FASTA grandes.
+    
+    El fichero se mapea en memoria y se divide por desplazamiento de bytes
+    en rangos que empiezan en una cabecera '>'. Los rangos se reparten entre
+    un pool de procesos y los resultados se juntan en el orden original, así
+    la lista devuelta y salida.gc son idénticos a los de la versión secuencial.
+    
+    Un fichero comprimido no se puede dividir por bytes, así que se procesa
+    con calculaPorcentajesGC_streaming (que descomprime en otro hilo).
+    
+    Parámetros:
+    - nomfich (str): Nombre del archivo FASTA a procesar
+    - procesos (int): Número de procesos (None = número de CPUs)
+    - partes (int): Número de rangos (por defecto 4 por proceso, para
+                    repartir mejor la carga si los registros son desiguales)
+    - tam_trozo (int): Bytes leídos en cada lectura dentro de un rango
+    - salida (str): Fichero de resultados
+    - formato (str): "texto", "gzip" o "binario" (ver EscritorGC)
+    
+    Retorna:
+    - list: Lista de porcentajes GC redondeados a 2 decimales
+    """
+    porcentajes = []
+    
+    try:
+        if _detecta_compresion(nomfich) is not None:
+            return calculaPorcentajesGC_streaming(nomfich, tam_trozo, salida, formato)
+        
+        with open(nomfich, 'rb') as f:
+            # mmap no admite ficheros vacíos
+            if os.fstat(f.fileno()).st_size == 0:
+                rangos = []
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                    if partes is None:
+                        partes = 4 * (procesos or os.cpu_count() or 1)
+                    rangos = _rangos_registros(mapa, partes)
+        
+        tareas = [(nomfich, inicio, fin, tam_trozo) for inicio, fin in rangos]
+        with Pool(procesos) as pool:
+            # map() devuelve los resultados en el orden de las tareas
+            resultados = pool.map(_gc_rango, tareas)
+        
+        with EscritorGC(salida, formato) as f_salida:
+            for registros in resultados:
+                for cabecera, porcentaje in registros:
+                    porcentajes.append(porcentaje)
+                    f_salida.escribir(cabecera, porcentaje)
+    
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {nomfich}")
+        return []
+    except Exception as e:
+        print(f"Error procesando archivo: {e}")
+        return []
+    
+    return porcentajes
+
+
+# ---------------------------------------------------------------------------
+# Perfiles de GC por ventanas deslizantes
+# ---------------------------------------------------------------------------
+
+class _VentanasGC:
+    """
+    Calcula el GC de ventanas deslizantes sobre una secuencia que llega por trozos.
+    
+    La secuencia se divide en bloques de mcd(ventana, paso) bases. Se guarda
+    la suma acumulada de G+C por bloque, así el GC de cualquier ventana es
+    la resta de dos sumas acumuladas (tiempo constante por ventana). Solo se
+    conservan las sumas que aún necesitan las ventanas pendientes, por lo
+    que la memoria no depende de la longitud de la secuencia.
+    """
+    
+    def __init__(self, ventana, paso, completas=True):
+        self.bloque = gcd(ventana, paso)
+        self.ventana = ventana
+        self.bloques_ventana = ventana // self.bloque
+        self.bloques_paso = paso // self.bloque
+        self.completas = completas
+        self.pendiente = b""            # Bases que aún no forman un bloque completo
+        self.acumulado = array('q', [0])  # acumulado[i] = G+C de los bloques anteriores a base+i
+        self.base = 0                   # Índice del bloque de acumulado[0]
+        self.siguiente = 0              # Bloque donde empieza la próxima ventana
+    
+    def _emitir(self):
+        """Genera las ventanas completas que ya se pueden calcular."""
+        acumulado = self.acumulado
+        disponibles = self.base + len(acumulado) - 1   # Bloques ya contados
+        bloque, ventana = self.bloque, self.ventana
+        while self.siguiente + self.bloques_ventana <= disponibles:
+            i = self.siguiente - self.base
+            inicio = self.siguiente * bloque
+            yield inicio, inicio + ventana, acumulado[i + self.bloques_ventana] - acumulado[i]
+            self.siguiente += self.bloques_paso
+        
+        # Descartamos las sumas que ya no necesita ninguna ventana
+        descartar = min(self.siguiente - self.base, len(acumulado) - 1)
+        if descartar > 0:
+            del acumulado[:descartar]
+            self.base += descartar
+    
+    def agregar(self, datos):
+        """
+        Añade un trozo de secuencia (bytes sin saltos de línea).
+        
+        Genera:
+        - tuple: (inicio, fin, num_gc) de cada ventana que queda completa
+        """
+        datos = self.pendiente + datos
+        bloque = self.bloque
+        usado = len(datos) - len(datos) % bloque
+        self.pendiente = datos[usado:]
+        
+        # G+C de cada bloque, acumulado a partir de la última suma
+        acumulado = self.acumulado
+        total = acumulado[-1]
+        for inicio in range(0, usado, bloque):
+            total += _contar_gc(datos[inicio:inicio + bloque])
+            acumulado.append(total)
+        yield from self._emitir()
+    
+    def terminar(self):
+        """
+        Termina la secuencia. Si completas es False, genera también las
+        ventanas que empiezan dentro de la secuencia pero no caben enteras
+        (con fin igual a la longitud de la secuencia).
+        """
+        if self.completas:
+            return
+        
+        acumulado = self.acumulado
+        ultimo = acumulado[-1] + _contar_gc(self.pendiente)
+        longitud = (self.base + len(acumulado) - 1) * self.bloque + len(self.pendiente)
+        while self.siguiente * self.bloque < longitud:
+            i = self.siguiente - self.base
+            inicio = self.siguiente * self.bloque
+            fin = inicio + self.ventana
+            if fin <= longitud:
+                num_gc = acumulado[i + self.bloques_ventana] - acumulado[i]
+            else:
+                fin = longitud
+                num_gc = ultimo - acumulado[i]
+            yield inicio, fin, num_gc
+            self.siguiente += self.bloques_paso
+
+
+def _eventos_ventanas_gc(f, ventana, paso, completas=True, tam_trozo=1 << 20):
+    """
+    Recorre un FASTA binario en streaming y genera eventos:
+    - ("registro", cabecera): comienzo de un registro (cabecera sin '>')
+    - ("ventana", (inicio, fin, num_gc)): ventana del registro actual,
+      con coordenadas 0-based y fin exclusivo
+    """
+    if ventana <= 0 or paso <= 0:
+        raise ValueError("La ventana y el paso deben ser positivos")
+    
+    ventanas = None
+    for tipo, datos in _eventos_fasta(f, tam_trozo):
+        if tipo == "cabecera":
+            if ventanas is not None:
+                for valores in ventanas.terminar():
+                    yield "ventana", valores
+            ventanas = _VentanasGC(ventana, paso, completas)
+            yield "registro", datos
+        elif ventanas is not None:
+            # Igual que en el resto de funciones, se ignora la secuencia sin cabecera
+            for valores in ventanas.agregar(datos):
+                yield "ventana", valores
+    
+    if ventanas is not None:
+        for valores in ventanas.terminar():
+            yield "ventana", valores
+
+
+def perfilGC(nomfich, ventana=1000, paso=100, completas=True, tam_trozo=1 << 20):
+    """
+    Calcula el perfil de GC por ventanas deslizantes de cada registro de un FASTA.
+    
+    A diferencia de calculaPorcentajesGC (un único porcentaje por registro),
+    devuelve la fracción de G+C de cada ventana de 'ventana' bases, avanzando
+    'paso' bases cada vez. Cada ventana se calcula en tiempo constante con
+    sumas acumuladas y el fichero se lee en streaming, así que se pueden
+    perfilar genomas completos sin cargarlos en memoria.
+    
+    Parámetros:
+    - nomfich (str): Nombre del archivo FASTA a procesar
+    - ventana (int): Tamaño de la ventana en bases
+    - paso (int): Desplazamiento entre ventanas consecutivas
+    - completas (bool): Si es False se incluyen al final las ventanas que no
+                        caben enteras (calculadas sobre las bases que hay)
+    - tam_trozo (int): Bytes leídos en cada lectura
+    
+    Genera:
+    - tuple: (cabecera, array('d')) por registro; la ventana i empieza en la
+             base i*paso. El array admite el protocolo buffer, así que se puede
+             convertir sin copia (por ejemplo numpy.frombuffer(valores))
+    """
+    with abreFasta(nomfich) as f:
+        cabecera = None
+        valores = array('d')
+        for tipo, datos in _eventos_ventanas_gc(f, ventana, paso, completas, tam_trozo):
+            if tipo == "registro":
+                if cabecera is not None:
+                    yield cabecera.decode(errors="replace"), valores
+                cabecera = datos
+                valores = array('d')
+            else:
+                inicio, fin, num_gc = datos
+                valores.append(num_gc / (fin - inicio))
+        
+        if cabecera is not None:
+            yield cabecera.decode(errors="replace"), valores
+
+
+def escribePerfilGC_bedgraph(nomfich, salida="salida.bedgraph", ventana=1000, paso=100,
+                             completas=True, tam_trozo=1 << 20):
+    """
+    Escribe el perfil de GC por ventanas en formato bedGraph, en streaming.
+    
+    Cada línea es "cromosoma<TAB>inicio<TAB>fin<TAB>fraccion_gc" con
+    coordenadas 0-based y fin exclusivo; el cromosoma es la primera palabra
+    de la cabecera. Si paso < ventana las ventanas se solapan.
+    
+    Parámetros:
+    - nomfich (str): Nombre del archivo FASTA a procesar
+    - salida (str): Fichero bedGraph de salida
+    - ventana, paso, completas, tam_trozo: Igual que en perfilGC
+    
+    Retorna:
+    - int: Número de ventanas escritas
+    """
+    num_ventanas = 0
+    with abreFasta(nomfich) as f_entrada, open(salida, 'wb') as f_salida:
+        nombre = b""
+        for tipo, datos in _eventos_ventanas_gc(f_entrada, ventana, paso, completas, tam_trozo):
+            if tipo == "registro":
+                partes = datos.split(None, 1)
+                nombre = partes[0] if partes else b""
+            else:
+                inicio, fin, num_gc = datos
+                f_salida.write(b"%s\t%d\t%d\t%.4f\n" % (nombre, inicio, fin, num_gc / (fin - inicio)))
+                num_ventanas += 1
+    
+    return num_ventanas
+
+
+# ---------------------------------------------------------------------------
+# Índice FASTA (.fai) y acceso directo a registros
+# ---------------------------------------------------------------------------
+
+# Entrada del índice, con los mismos campos que una línea de un .fai de samtools
+EntradaFai = namedtuple("EntradaFai", ["longitud", "desplazamiento", "bases_linea", "bytes_linea"])
+
+
+def _entrada_registro(mapa, nombre, inicio, fin, lineas_por_trozo=1 << 16):
+    """
+    Calcula la entrada del índice de la secuencia que ocupa los bytes
+    [inicio, fin) del fichero (sin la cabecera).
+    
+    Todas las líneas deben tener la misma longitud salvo la última, como
+    exige el formato .fai; la comprobación se hace por bloques de líneas
+    mirando con un slice con paso que cada línea termina en '\\n'.
+    """
+    # Quitamos los saltos de línea del final del registro
+    while fin > inicio and mapa[fin - 1] in b"\r\n":
+        fin -= 1
+    if fin == inicio:
+        return EntradaFai(0, inicio, 0, 0)
+    
+    primer_salto = mapa.find(b"\n", inicio, fin)
+    if primer_salto == -1:
+        # Secuencia de una sola línea: su fin de línea puede ser \n o \r\n
+        terminador = 2 if mapa[fin:fin + 2] == b"\r\n" else 1
+        return EntradaFai(fin - inicio, inicio, fin - inicio, fin - inicio + terminador)
+    
+    bytes_linea = primer_salto - inicio + 1
+    bases_linea = bytes_linea - (2 if mapa[primer_salto - 1] == ord("\r") else 1)
+    lineas_completas, resto = divmod(fin - inicio, bytes_linea)
+    
+    # Las líneas completas terminan cada bytes_linea bytes y no hay más saltos
+    final_completas = inicio + lineas_completas * bytes_linea
+    paso = bytes_linea * lineas_por_trozo
+    for posicion in range(inicio, final_completas, paso):
+        trozo = mapa[posicion:min(posicion + paso, final_completas)]
+        lineas = len(trozo) // bytes_linea
+        if (trozo.count(b"\n") != lineas
+                or trozo[bytes_linea - 1::bytes_linea].count(b"\n") != lineas):
+            raise ValueError(f"El registro {nombre.decode(errors='replace')} tiene líneas de distinta longitud")
+    if resto > bases_linea or mapa.find(b"\n", final_completas, fin) != -1:
+        raise ValueError(f"El registro {nombre.decode(errors='replace')} tiene líneas de distinta longitud")
+    
+    return EntradaFai(lineas_completas * bases_linea + resto, inicio, bases_linea, bytes_linea)
+
+
+def _inicios_cabecera(mapa):
+    """Genera la posición de cada '>' que empieza una línea del fichero."""
+    if mapa[:1] == b">":
+        yield 0
+    posicion = mapa.find(b"\n>")
+    while posicion != -1:
+        yield posicion + 1
+        posicion = mapa.find(b"\n>", posicion + 1)
+
+
+def indexaFasta(nomfich, fichero_indice=None):
+    """
+    Construye el índice de un FASTA y lo guarda en un fichero compatible
+    con el .fai de samtools (nombre, longitud, desplazamiento, bases por
+    línea y bytes por línea, separados por tabuladores).
+    
+    El nombre de cada registro es la primera palabra de su cabecera.
+    
+    Parámetros:
+    - nomfich (str): Nombre del archivo FASTA
+    - fichero_indice (str): Fichero de índice (por defecto nomfich + ".fai")
+    
+    Retorna:
+    - dict: {nombre: EntradaFai} en el orden del fichero
+    """
+    if fichero_indice is None:
+        fichero_indice = nomfich + ".fai"
+    if _detecta_compresion(nomfich) is not None:
+        raise ValueError(f"{nomfich} está comprimido; el índice .fai necesita el FASTA sin comprimir")
+    
+    indice = {}
+    with open(nomfich, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                tamano = len(mapa)
+                inicios = list(_inicios_cabecera(mapa))
+                for cabecera, fin in zip(inicios, inicios[1:] + [tamano]):
+                    fin_cabecera = mapa.find(b"\n", cabecera, fin)
+                    if fin_cabecera == -1:
+                        fin_cabecera = fin
+                    palabras = mapa[cabecera + 1:fin_cabecera].split(None, 1)
+                    nombre = palabras[0] if palabras else b""
+                    if nombre in indice:
+                        raise ValueError(f"Nombre de registro repetido: {nombre.decode(errors='replace')}")
+                    indice[nombre] = _entrada_registro(mapa, nombre, min(fin_cabecera + 1, fin), fin)
+    
+    with open(fichero_indice, 'wb') as f_indice:
+        for nombre, entrada in indice.items():
+            f_indice.write(b"%s\t%d\t%d\t%d\t%d\n" % (nombre, *entrada))
+    
+    return {nombre.decode(errors="replace"): entrada for nombre, entrada in indice.items()}
+
+
+def cargaIndiceFasta(nomfich, fichero_indice=None):
+    """
+    Carga el índice .fai de un FASTA; si no existe o es más antiguo que el
+    FASTA, lo construye de nuevo con indexaFasta.
+    
+    Parámetros:
+    - nomfich (str): Nombre del archivo FASTA
+    - fichero_indice (str): Fichero de índice (por defecto nomfich + ".fai")
+    
+    Retorna:
+    - dict: {nombre: EntradaFai}
+    """
+    if fichero_indice is None:
+        fichero_indice = nomfich + ".fai"
+    
+    try:
+        if os.path.getmtime(fichero_indice) < os.path.getmtime(nomfich):
+            return indexaFasta(nomfich, fichero_indice)
+        indice = {}
+        with open(fichero_indice, 'r') as f_indice:
+            for linea in f_indice:
+                campos = linea.rstrip("\n").split("\t")
+                indice[campos[0]] = EntradaFai(*map(int, campos[1:5]))
+        return indice
+    except FileNotFoundError:
+        return indexaFasta(nomfich, fichero_indice)
+
+
+class FastaIndexado:
+    """
+    Acceso directo a los registros de un FASTA mediante su índice .fai.
+    
+    Para leer un registro o un tramo se calcula su desplazamiento en bytes
+    a partir del índice y se va directamente a él con seek(), sin recorrer
+    el resto del fichero.
+    
+    Ejemplo:
+        with FastaIndexado("genoma.fa") as fasta:
+            fasta.secuencia("chr1", 1000, 2000)
+            fasta.porcentajeGC("chr2")
+    """
+    
+    def __init__(self, nomfich, fichero_indice=None):
+        self.indice = cargaIndiceFasta(nomfich, fichero_indice)
+        self.fichero = open(nomfich, 'rb')
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.fichero.close()
+    
+    def __contains__(self, nombre):
+        return nombre in self.indice
+    
+    def nombres(self):
+        """Nombres de los registros en el orden del fichero."""
+        return list(self.indice)
+    
+    def longitud(self, nombre):
+        """Número de bases del registro."""
+        return self._entrada(nombre).longitud
+    
+    def _entrada(self, nombre):
+        try:
+            return self.indice[nombre]
+        except KeyError:
+            raise KeyError(f"No existe el registro {nombre}") from None
+    
+    def _trozos(self, nombre, inicio=0, fin=None, tam_trozo=1 << 20):
+        """
+        Genera las bases del tramo [inicio, fin) del registro en trozos de
+        bytes sin saltos de línea, leyendo solo esa parte del fichero.
+        """
+        entrada = self._entrada(nombre)
+        if fin is None:
+            fin = entrada.longitud
+        if not 0 <= inicio <= fin <= entrada.longitud:
+            raise ValueError(f"Tramo [{inicio}, {fin}) fuera del registro {nombre} "
+                             f"de longitud {entrada.longitud}")
+        
+        # Trozos de líneas completas para que el cálculo de posiciones sea exacto
+        bases_trozo = max(1, tam_trozo // max(entrada.bytes_linea, 1)) * max(entrada.bases_linea, 1)
+        for posicion in range(inicio, fin, bases_trozo):
+            ultima = min(posicion + bases_trozo, fin)
+            desde = self._posicion_byte(entrada, posicion)
+            hasta = self._posicion_byte(entrada, ultima - 1) + 1
+            self.fichero.seek(desde)
+            yield self.fichero.read(hasta - desde).translate(None, b"\r\n")
+    
+    @staticmethod
+    def _posicion_byte(entrada, base):
+        """Desplazamiento en bytes de una base del registro."""
+        linea, columna = divmod(base, entrada.bases_linea)
+        return entrada.desplazamiento + linea * entrada.bytes_linea + columna
+    
+    def secuencia(self, nombre, inicio=0, fin=None):
+        """
+        Devuelve la secuencia del registro, o el tramo [inicio, fin) con
+        coordenadas 0-based y fin exclusivo (como un slice de Python).
+        """
+        return b"".join(self._trozos(nombre, inicio, fin)).decode()
+    
+    def porcentajeGC(self, nombre, inicio=0, fin=None):
+        """
+        Porcentaje GC del registro o de un tramo, redondeado a 2 decimales
+        como en calculaPorcentajesGC. Se lee por trozos, sin construir la
+        secuencia entera. Devuelve 0.0 si el tramo está vacío, como
+        calcular_porcentaje_gc con una secuencia vacía.
+        """
+        num_gc = 0
+        total = 0
+        for trozo in self._trozos(nombre, inicio, fin):
+            num_gc += _contar_gc(trozo)
+            total += len(trozo)
+        if total == 0:
+            return 0.0
+        return round(num_gc / total, 2)
+
+
+def calculaPorcentajeGCRegion(nomfich, nombre, inicio=0, fin=None):
+    """
+    Calcula el porcentaje GC de un solo registro (o de un tramo suyo) usando
+    el índice .fai, que se crea la primera vez. El resto del fichero no se lee.
+    
+    Parámetros:
+    - nomfich (str): Nombre del archivo FASTA
+    - nombre (str): Primera palabra de la cabecera del registro
+    - inicio, fin (int): Tramo 0-based con fin exclusivo (por defecto, todo)
+    
+    Retorna:
+    - float: Porcentaje GC redondeado a 2 decimales (0.0 si el tramo está vacío)
+    """
+    with FastaIndexado(nomfich) as fasta:
+        return fasta.porcentajeGC(nombre, inicio, fin)
+
+
 if __name__ == "__main__":
     print("=== Prueba de la función calculaPorcentajesGC ===")
     
@@ -186,4 +1216,56 @@ TTATTCCTAGAACCAGGCGACCTGCGACTCCTTGACGTTGACAATCGAGTAGTACTCCCG"""
         gc_count = seq.count('G') + seq.count('C')
         total = len(seq)
         porcentaje = round(gc_count / total, 2)
-        print(f"Secuencia {i+1}: {gc_count} GC de {total} total = {porcentaje}")
\ No newline at end of file
+        print(f"Secuencia {i+1}: {gc_count} GC de {total} total = {porcentaje}")
+    
+    # Motor de composición
+    print("\n=== Composición de nucleótidos ===")
+    comp = composicionNucleotidos("ACGTacgtNRYnn")
+    print(f"G: {comp.base('G')}, enmascaradas: {comp.enmascaradas}, ambiguas: {comp.ambiguas}")
+    print("Esperado: G: 2, enmascaradas: 6, ambiguas: 5")
+    
+    # Versión en streaming
+    print("\n=== Verificando versión en streaming ===")
+    print(f"calculaPorcentajesGC('prueba.fa', modo='streaming') = {calculaPorcentajesGC('prueba.fa', modo='streaming')}")
+    print("Esperado: [0.52, 0.57, 0.5, 0.51]")
+    with open("prueba_espacios.fa", "w") as f:
+        f.write(">s1\nGG CC AA\n  GC \n>s2\nA\tT G\nCC\n")
+    print(f"Con espacios dentro de las líneas: {calculaPorcentajesGC('prueba_espacios.fa', salida='salida_espacios.gc')} "
+          f"{calculaPorcentajesGC('prueba_espacios.fa', modo='streaming', salida='salida_espacios.gc')}")
+    print("Esperado: [0.6, 0.43] [0.6, 0.43]")
+    
+    # Versión en paralelo
+    print("\n=== Verificando versión en paralelo ===")
+    print(f"calculaPorcentajesGC_paralelo('prueba.fa', procesos=2) = {calculaPorcentajesGC_paralelo('prueba.fa', procesos=2)}")
+    print("Esperado: [0.52, 0.57, 0.5, 0.51]")
+    
+    # Perfil de GC por ventanas
+    print("\n=== Perfil de GC (ventana 40, paso 20) ===")
+    for cabecera, valores in perfilGC('prueba.fa', ventana=40, paso=20):
+        print(f"{cabecera.split()[0]}: {[round(v, 2) for v in valores]}")
+    print("Esperado (primer registro): [0.47, 0.55]")
+    num = escribePerfilGC_bedgraph('prueba.fa', 'prueba.bedgraph', ventana=40, paso=20)
+    print(f"Ventanas escritas en prueba.bedgraph: {num}")
+    
+    # Acceso directo con el índice .fai
+    print("\n=== Índice FASTA (prueba.fa.fai) ===")
+    with FastaIndexado('prueba.fa') as fasta:
+        nombre = fasta.nombres()[2]
+        print(f"{nombre}: longitud {fasta.longitud(nombre)}, GC {fasta.porcentajeGC(nombre)}")
+        print("Esperado: longitud 86, GC 0.5")
+        print(f"Bases 55-65: {fasta.secuencia(nombre, 55, 65)}")
+        print("Esperado: Bases 55-65: TAAACCAAAC")
+    with open("prueba_crlf.fa", "wb") as f:
+        f.write(b">a\r\nACGTAC\r\n>b\r\nGGGG\r\nCC\r\n")
+    print(f"Registro de una línea con CRLF: {indexaFasta('prueba_crlf.fa')['a']}")
+    print("Esperado: EntradaFai(longitud=6, desplazamiento=4, bases_linea=6, bytes_linea=8)")
+    
+    # Salida configurable: comprimida y binaria por columnas
+    print("\n=== Salida en gzip y en binario ===")
+    calculaPorcentajesGC('prueba.fa', salida='prueba.gc.gz', formato='gzip')
+    with gzip.open('prueba.gc.gz', 'rt') as f:
+        print(f"Primeras líneas de prueba.gc.gz: {f.read().splitlines()[:2]}")
+    calculaPorcentajesGC('prueba.fa', salida='prueba.gcb', formato='binario')
+    cabeceras, valores = leeSalidaGC_binaria('prueba.gcb')
+    print(f"prueba.gcb: {len(cabeceras)} registros, porcentajes {list(valores)}")
+    print("Esperado: 4 registros, porcentajes [0.52, 0.57, 0.5, 0.51]")
\ No newline at end of file
@@ -0,0 +1,116 @@
+# Lectura de FASTA en streaming compartida por eje1.py y eje3.py
+
+"""
+Lector de FASTA por trozos binarios de tamaño fijo, sin construir nunca las
+secuencias completas. eje1.py (comparación de dos FASTA alineados) y eje3.py
+(porcentajes y ventanas GC) lo importan en lugar de llevar cada uno su copia.
+"""
+
+# Fines de línea: nunca cuentan como bases
+FINES_LINEA = b"\r\n"
+
+# Espacios dentro de una línea: como con el strip() de cada línea de la
+# lectura en modo texto, solo se quitan los del principio y el final
+ESPACIOS_LINEA = b" \t\x0b\x0c"
+
+
+def _quita_extremos(datos, espacios, en_linea):
+    """
+    Quita los fines de línea de un trozo de secuencia y los espacios del
+    principio y el final de cada línea, dejando los de en medio. Las líneas
+    pueden estar partidas entre trozos, así que se lleva un estado:
+    - espacios (bytes): espacios al final de la última línea, que aún no se
+      sabe si son de en medio (si la línea sigue) o del final
+    - en_linea (bool): la línea actual ya tiene alguna base
+    
+    Retorna:
+    - tuple: (bases, espacios, en_linea)
+    """
+    # Caso habitual: sin espacios en las líneas, solo hay que quitar los fines
+    if len(datos.translate(None, ESPACIOS_LINEA)) == len(datos):
+        bases = datos.translate(None, FINES_LINEA)
+        if espacios and datos[:1] not in (b"\r", b"\n"):
+            bases = espacios + bases
+        return bases, b"", datos[-1:] not in (b"\r", b"\n")
+    
+    partes = []
+    for linea in datos.splitlines(keepends=True):
+        contenido = linea.rstrip(FINES_LINEA)
+        termina = len(contenido) != len(linea)
+        if not en_linea:
+            contenido = contenido.lstrip(ESPACIOS_LINEA)
+        nucleo = contenido.rstrip(ESPACIOS_LINEA)
+        if nucleo:
+            partes.append(espacios)
+            partes.append(nucleo)
+            espacios = contenido[len(nucleo):]
+            en_linea = True
+        else:
+            espacios += contenido
+        if termina:
+            # La línea termina aquí: sus espacios finales no cuentan
+            espacios = b""
+            en_linea = False
+    return b"".join(partes), espacios, en_linea
+
+
+def eventos_fasta(f, tam_trozo=1 << 20):
+    """
+    Lee un FASTA binario por trozos de tamaño fijo y genera eventos:
+    - ("cabecera", bytes): cabecera sin '>' ni salto de línea
+    - ("secuencia", bytes): trozo de secuencia sin saltos de línea ni los
+      espacios del principio y el final de cada línea (como strip())
+    
+    Las cabeceras partidas entre dos trozos se reconstruyen; la secuencia
+    nunca se acumula, se entrega trozo a trozo.
+    
+    Parámetros:
+    - f: Fichero abierto en modo binario (o cualquier objeto con read())
+    - tam_trozo (int): Bytes leídos en cada lectura
+    """
+    en_cabecera = False   # Estamos dentro de una línea de cabecera
+    inicio_linea = True   # La siguiente posición es principio de línea
+    cabecera = b""
+    espacios = b""        # Espacios pendientes al final de la línea actual
+    en_linea = False      # La línea de secuencia actual ya tiene bases
+    
+    while True:
+        trozo = f.read(tam_trozo)
+        if not trozo:
+            break
+        
+        pos = 0
+        while pos < len(trozo):
+            if en_cabecera:
+                fin = trozo.find(b"\n", pos)
+                if fin == -1:
+                    # La cabecera continúa en el siguiente trozo
+                    cabecera += trozo[pos:]
+                    break
+                cabecera += trozo[pos:fin]
+                yield ("cabecera", cabecera.rstrip(b"\r"))
+                cabecera = b""
+                en_cabecera = False
+                inicio_linea = True
+                pos = fin + 1
+            elif inicio_linea and trozo[pos] == ord(">"):
+                en_cabecera = True
+                pos += 1
+            else:
+                # Secuencia hasta la próxima cabecera o el final del trozo
+                fin = trozo.find(b"\n>", pos)
+                if fin == -1:
+                    datos = trozo[pos:]
+                    inicio_linea = datos.endswith(b"\n")
+                    pos = len(trozo)
+                else:
+                    datos = trozo[pos:fin + 1]
+                    inicio_linea = True
+                    pos = fin + 1
+                datos, espacios, en_linea = _quita_extremos(datos, espacios, en_linea)
+                if datos:
+                    yield ("secuencia", datos)
+    
+    # Cabecera al final del fichero sin salto de línea
+    if en_cabecera:
+        yield ("cabecera", cabecera.rstrip(b"\r"))
@@ -1,6 +1,18 @@
 # Nombre: [Tu nombre aquí]
 # Turno: [Tu turno aquí]
 
+import gzip
+import hashlib
+import marshal
+import os
+import re
+import sys
+from array import array
+from collections import deque, namedtuple
+from functools import lru_cache
+from multiprocessing import Pool
+
+
 def creaDiccionario(fichero="enzimas.txt"):
     """
     Función que lee un fichero de enzimas de restricción y crea un diccionario.
@@ -62,6 +74,70 @@ def creaDiccionario(fichero="enzimas.txt"):
     return diccionario_enzimas
 
 
+# ---------------------------------------------------------------------------
+# Caché de la base de datos de enzimas
+# ---------------------------------------------------------------------------
+
+# {ruta absoluta: ((mtime_ns, tamaño), diccionario)}
+_cache_enzimas = {}
+
+
+def cargaEnzimas(fichero="enzimas.txt"):
+    """
+    Devuelve el diccionario de enzimas de un fichero leyéndolo solo una vez
+    por proceso: se guarda en una caché asociado a la ruta del fichero y a
+    su fecha de modificación y tamaño, y se vuelve a leer solo si cambian.
+    
+    El diccionario devuelto es compartido, no debe modificarse (para tener
+    una copia propia, usar creaDiccionario).
+    
+    Parámetros:
+    - fichero (str): Ruta del fichero con la información de las enzimas
+    
+    Retorna:
+    - dict: {nombre_enzima: [secuencia_reconocimiento, posicion_corte]}
+    """
+    ruta = os.path.abspath(fichero)
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        # Sin fichero no hay nada que guardar; creaDiccionario gestiona el error
+        return creaDiccionario(fichero)
+    
+    version = (estado.st_mtime_ns, estado.st_size)
+    entrada = _cache_enzimas.get(ruta)
+    if entrada is not None and entrada[0] == version:
+        return entrada[1]
+    
+    diccionario = creaDiccionario(fichero)
+    # creaDiccionario devuelve {} si hay un error (formato incorrecto...): no
+    # se guarda, así la próxima llamada lo vuelve a intentar y a avisar
+    if diccionario:
+        _cache_enzimas[ruta] = (version, diccionario)
+    return diccionario
+
+
+def invalidaCacheEnzimas(fichero=None):
+    """
+    Borra de la caché las enzimas de un fichero (o todas si fichero es None),
+    para forzar que se vuelvan a leer en la próxima llamada.
+    """
+    if fichero is None:
+        _cache_enzimas.clear()
+        _cache_automatas.clear()
+        _automatas_instantanea.clear()
+        _cache_sitios.clear()
+        _cache_digestiones.clear()
+    else:
+        ruta = os.path.abspath(fichero)
+        _cache_enzimas.pop(ruta, None)
+        _cache_automatas.pop(ruta, None)
+        _automatas_instantanea.pop(ruta, None)
+        _cache_sitios.pop(ruta, None)
+        for clave in [clave for clave in _cache_digestiones if clave[0] == ruta]:
+            del _cache_digestiones[clave]
+
+
 def catalizaSecuencia1Corte(nombre_enzima, secuencia, fichero="enzimas.txt"):
     """
     Simula el corte de una secuencia de ADN por una enzima de restricción específica.
@@ -85,8 +161,8 @@ def catalizaSecuencia1Corte(nombre_enzima, secuencia, fichero="enzimas.txt"):
     - Resultado: dos fragmentos
     """
     
-    # Obtenemos el diccionario de enzimas
-    diccionario = creaDiccionario(fichero)
+    # Obtenemos el diccionario de enzimas (leído una sola vez, ver cargaEnzimas)
+    diccionario = cargaEnzimas(fichero)
     
     # Verificamos si la enzima existe en nuestro diccionario
     if nombre_enzima not in diccionario:
@@ -98,8 +174,9 @@ def catalizaSecuencia1Corte(nombre_enzima, secuencia, fichero="enzimas.txt"):
     posicion_corte = diccionario[nombre_enzima][1]
     
     # Buscamos la secuencia de reconocimiento en el ADN
-    # find() devuelve la posición de la primera aparición o -1 si no encuentra
-    indice_reconocimiento = secuencia.find(secuencia_reconocimiento)
+    # Como find(), devuelve la posición de la primera aparición o -1 si no
+    # encuentra; los sitios con códigos IUPAC (GGNNCC) usan su patrón compilado
+    indice_reconocimiento = cargaSitiosEnzimas(fichero)[nombre_enzima].primera(secuencia)
     
     # Si no se encuentra la secuencia de reconocimiento
     if indice_reconocimiento == -1:
@@ -133,40 +210,948 @@ def catalizaSecuenciaTodasEnzimas(secuencia, nfs="catalizadoras.txt", nfe="enzim
     nombre_enzima;fragmento1;fragmento2
     
     Solo se incluyen las enzimas que efectivamente cortan la secuencia.
+    
+    Con muchas enzimas, en lugar de buscar cada una por separado, la
+    secuencia se recorre una sola vez con el autómata de todas las enzimas
+    (ver AutomataEnzimas). Con pocas (hasta _UMBRAL_AUTOMATA) es más rápido
+    un find() por enzima, igual que en la digestión.
     """
     
     # Obtenemos todas las enzimas disponibles
-    diccionario = creaDiccionario(nfe)
+    diccionario = cargaEnzimas(nfe)
+    
+    # Primera aparición de cada enzima
+    if len(diccionario) > _UMBRAL_AUTOMATA:
+        # Un único recorrido de la secuencia con el autómata
+        primeras = cargaAutomataEnzimas(nfe).primeras_apariciones(secuencia)
+    else:
+        primeras = {}
+        for nombre_enzima, sitio in cargaSitiosEnzimas(nfe).items():
+            inicio = sitio.primera(secuencia)
+            if inicio != -1:
+                primeras[nombre_enzima] = inicio
     
     # Abrimos el fichero de salida para escritura
     with open(nfs, 'w') as archivo_salida:
-        # Probamos cada enzima del diccionario
-        for nombre_enzima in diccionario:
-            # Intentamos cortar la secuencia con esta enzima
-            fragmentos = catalizaSecuencia1Corte(nombre_enzima, secuencia, nfe)
-            
-            # Si la función devuelve 2 fragmentos, significa que hubo corte
-            if len(fragmentos) == 2:
-                # Escribimos la línea en el formato especificado
-                linea = f"{nombre_enzima};{fragmentos[0]};{fragmentos[1]}\n"
+        # Recorremos las enzimas en el orden del fichero
+        for nombre_enzima, (_, posicion_corte) in diccionario.items():
+            # Solo cortan las enzimas cuya secuencia aparece
+            if nombre_enzima in primeras:
+                # Mismo corte que catalizaSecuencia1Corte
+                punto_corte = primeras[nombre_enzima] + posicion_corte
+                linea = f"{nombre_enzima};{secuencia[:punto_corte]};{secuencia[punto_corte:]}\n"
                 archivo_salida.write(linea)
 
 
+# ---------------------------------------------------------------------------
+# Sitios de reconocimiento degenerados (códigos IUPAC)
+# ---------------------------------------------------------------------------
+
+# Bases que representa cada código IUPAC
+_IUPAC = {
+    "A": "A", "C": "C", "G": "G", "T": "T",
+    "R": "AG", "Y": "CT", "S": "CG", "W": "AT", "K": "GT", "M": "AC",
+    "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT",
+}
+
+# Códigos que no son una base concreta
+_IUPAC_AMBIGUOS = frozenset("RYSWKMBDHVN")
+
+# Complementario de cada código IUPAC (R=AG se empareja con Y=CT, etc.)
+_COMPLEMENTO_IUPAC = str.maketrans("ACGTRYSWKMBDHVN", "TGCAYRSWMKVHDBN")
+
+
+def complementarioInverso(secuencia):
+    """Secuencia complementaria inversa (la otra hebra leída de 5' a 3')."""
+    return secuencia.translate(_COMPLEMENTO_IUPAC)[::-1]
+
+
+@lru_cache(maxsize=None)
+def compilaSitio(sitio, binario=False):
+    """
+    Compila un sitio de reconocimiento con códigos IUPAC en una expresión
+    regular (GGNNCC → GG[ACGT][ACGT]CC). El resultado se guarda en caché, así
+    que cada sitio se compila una sola vez aunque lo compartan varias enzimas.
+    
+    El patrón va dentro de una búsqueda anticipada (?=...) para que finditer
+    encuentre también los sitios solapados.
+    
+    Parámetros:
+    - sitio (str): Secuencia de reconocimiento
+    - binario (bool): Compilar para buscar en bytes en lugar de str
+    
+    Retorna:
+    - re.Pattern: Expresión regular compilada
+    """
+    partes = []
+    for codigo in sitio:
+        bases = _IUPAC.get(codigo)
+        if bases is None:
+            partes.append(re.escape(codigo))
+        elif len(bases) == 1:
+            partes.append(bases)
+        else:
+            partes.append(f"[{bases}]")
+    patron = "(?=" + "".join(partes) + ")"
+    return re.compile(patron.encode() if binario else patron)
+
+
+class SitioEnzima:
+    """
+    Sitio de reconocimiento de una enzima preparado para buscarlo: sabe si
+    es degenerado (tiene códigos IUPAC ambiguos), si es palindrómico (igual
+    a su complementario inverso) y guarda sus patrones ya compilados.
+    
+    Atributos:
+    - sitio (str): Secuencia de reconocimiento
+    - posicion (int): Posición de corte relativa al inicio del sitio
+    - longitud (int): Longitud del sitio
+    - degenerado (bool): Si contiene códigos IUPAC ambiguos
+    - inverso (str): Complementario inverso del sitio
+    - palindromico (bool): Si el sitio es igual a su complementario inverso
+    """
+    
+    __slots__ = ("sitio", "posicion", "longitud", "degenerado", "inverso", "palindromico")
+    
+    def __init__(self, sitio, posicion):
+        self.sitio = sitio
+        self.posicion = posicion
+        self.longitud = len(sitio)
+        self.degenerado = not _IUPAC_AMBIGUOS.isdisjoint(sitio)
+        self.inverso = complementarioInverso(sitio)
+        self.palindromico = self.inverso == sitio
+    
+    def primera(self, secuencia):
+        """
+        Posición de la primera aparición del sitio en la hebra dada (o -1),
+        como secuencia.find() pero entendiendo los códigos IUPAC.
+        """
+        if not self.degenerado:
+            return secuencia.find(self.sitio if isinstance(secuencia, str) else self.sitio.encode())
+        encontrado = compilaSitio(self.sitio, not isinstance(secuencia, str)).search(secuencia)
+        return encontrado.start() if encontrado else -1
+    
+    def sitios(self, secuencia, ambas_hebras=True):
+        """
+        Genera todos los sitios (solapados incluidos) como (inicio, hebra),
+        con hebra 1 en la hebra dada y -1 en la complementaria. En la hebra
+        complementaria se busca el complementario inverso del sitio; si el
+        sitio es palindrómico no hace falta, porque son los mismos sitios.
+        """
+        binario = not isinstance(secuencia, str)
+        for encontrado in compilaSitio(self.sitio, binario).finditer(secuencia):
+            yield encontrado.start(), 1
+        if ambas_hebras and not self.palindromico:
+            for encontrado in compilaSitio(self.inverso, binario).finditer(secuencia):
+                yield encontrado.start(), -1
+    
+    def corte(self, inicio, hebra=1):
+        """
+        Posición de corte (en coordenadas de la hebra dada) de un sitio que
+        empieza en 'inicio'. En la hebra complementaria el sitio se lee al
+        revés, así que la posición de corte se cuenta desde su final.
+        """
+        if hebra == 1:
+            return inicio + self.posicion
+        return inicio + self.longitud - self.posicion
+
+
+# {ruta absoluta: (diccionario, {nombre_enzima: SitioEnzima})}
+_cache_sitios = {}
+
+
+def cargaSitiosEnzimas(fichero="enzimas.txt"):
+    """
+    Devuelve el SitioEnzima de cada enzima del fichero. Se construyen una
+    vez junto al diccionario de cargaEnzimas y se reutilizan mientras el
+    fichero no cambie.
+    
+    Parámetros:
+    - fichero (str): Ruta del fichero con la información de las enzimas
+    
+    Retorna:
+    - dict: {nombre_enzima: SitioEnzima}
+    """
+    diccionario = cargaEnzimas(fichero)
+    ruta = os.path.abspath(fichero)
+    entrada = _cache_sitios.get(ruta)
+    if entrada is not None and entrada[0] is diccionario:
+        return entrada[1]
+    
+    sitios = {nombre: SitioEnzima(secuencia, posicion)
+              for nombre, (secuencia, posicion) in diccionario.items()}
+    _cache_sitios[ruta] = (diccionario, sitios)
+    return sitios
+
+
+# ---------------------------------------------------------------------------
+# Autómata de Aho-Corasick con los sitios de reconocimiento de las enzimas
+# ---------------------------------------------------------------------------
+
+class AutomataEnzimas:
+    """
+    Autómata de Aho-Corasick construido con las secuencias de reconocimiento
+    de un diccionario de enzimas (el que devuelve creaDiccionario).
+    
+    Encuentra todos los sitios de todas las enzimas recorriendo la secuencia
+    una sola vez, en lugar de hacer un find() por enzima. La tabla de
+    transiciones está completa (cada estado tiene una fila con el siguiente
+    estado para cada carácter), así que cada base cuesta una sola consulta.
+    
+    Ejemplo:
+        automata = AutomataEnzimas(creaDiccionario("enzimas.txt"))
+        automata.primeras_apariciones("AAAGAATTC")   # {'EcoRI': 3}
+    """
+    
+    def __init__(self, diccionario):
+        self.nombres = []       # Enzima de cada patrón
+        self.longitudes = []    # Longitud de cada patrón
+        self.vacias = []        # Enzimas con secuencia de reconocimiento vacía
+        self.degenerados = {}   # Enzimas con códigos IUPAC ambiguos: se buscan con su patrón
+        
+        # 1. Trie con las secuencias de reconocimiento
+        hijos = [{}]
+        salidas = [()]
+        for nombre, (secuencia, _) in diccionario.items():
+            if not secuencia:
+                self.vacias.append(nombre)
+                continue
+            if not _IUPAC_AMBIGUOS.isdisjoint(secuencia):
+                self.degenerados[nombre] = secuencia
+                continue
+            estado = 0
+            for caracter in secuencia:
+                siguiente = hijos[estado].get(caracter)
+                if siguiente is None:
+                    siguiente = hijos[estado][caracter] = len(hijos)
+                    hijos.append({})
+                    salidas.append(())
+                estado = siguiente
+            salidas[estado] += (len(self.nombres),)
+            self.nombres.append(nombre)
+            self.longitudes.append(len(secuencia))
+        
+        # Cada carácter de los patrones tiene un código; el resto, el código k
+        alfabeto = sorted({caracter for h in hijos for caracter in h})
+        self.codigos = {caracter: i for i, caracter in enumerate(alfabeto)}
+        k = len(alfabeto)
+        if all(caracter.isascii() for caracter in alfabeto):
+            self._tabla_bytes = bytes(self.codigos.get(chr(b), k) for b in range(256))
+        else:
+            self._tabla_bytes = None
+        
+        # 2. Enlaces de fallo por niveles (BFS) y tabla de transiciones completa:
+        # la fila de un estado es la de su estado de fallo más sus propios hijos
+        tabla = [None] * len(hijos)
+        fallo = [0] * len(hijos)
+        tabla[0] = [hijos[0].get(caracter, 0) for caracter in alfabeto] + [0]
+        cola = deque(hijos[0].values())
+        while cola:
+            estado = cola.popleft()
+            fila_fallo = tabla[fallo[estado]]
+            salidas[estado] += salidas[fallo[estado]]
+            fila = list(fila_fallo)
+            for caracter, siguiente in hijos[estado].items():
+                codigo = self.codigos[caracter]
+                fallo[siguiente] = fila_fallo[codigo]
+                fila[codigo] = siguiente
+                cola.append(siguiente)
+            tabla[estado] = fila
+        
+        self.tabla = tabla
+        self.fallo = fallo
+        self.salidas = salidas
+    
+    def _estado(self):
+        """
+        Datos del autómata en pocos objetos grandes (textos y arrays en bytes),
+        para guardarlo en una instantánea: cargar decenas de miles de listas
+        y tuplas pequeñas costaría casi lo mismo que volver a construirlas.
+        
+        De cada estado se guardan solo sus salidas propias: las que hereda de
+        su estado de fallo se recuperan al cargar (ver _desde_estado).
+        """
+        tabla, fallo, salidas = self.tabla, self.fallo, self.salidas
+        propias = [salida[:len(salida) - len(salidas[fallo[estado]])] if estado else salida
+                   for estado, salida in enumerate(salidas)]
+        desplazamientos = array("i", [0])
+        for salida in propias:
+            desplazamientos.append(desplazamientos[-1] + len(salida))
+        return (
+            _uneTextos(self.nombres),
+            array("i", self.longitudes).tobytes(),
+            self.vacias,
+            self.degenerados,
+            self.codigos,
+            self._tabla_bytes,
+            len(tabla[0]),
+            array("i", [siguiente for fila in tabla for siguiente in fila]).tobytes(),
+            array("i", fallo).tobytes(),
+            desplazamientos.tobytes(),
+            array("i", [patron for salida in propias for patron in salida]).tobytes(),
+        )
+    
+    @classmethod
+    def _desde_estado(cls, estado):
+        """Reconstruye el autómata a partir de _estado() sin volver a construirlo."""
+        (nombres, longitudes, vacias, degenerados, codigos, tabla_bytes,
+         ancho, tabla, fallo, desplazamientos, propias) = estado
+        automata = cls.__new__(cls)
+        automata.longitudes = _desdeBytes("i", longitudes)
+        automata.nombres = _separaTextos(nombres, len(automata.longitudes))
+        automata.vacias = vacias
+        automata.degenerados = degenerados
+        automata.codigos = codigos
+        automata._tabla_bytes = tabla_bytes
+        tabla = _desdeBytes("i", tabla)
+        automata.tabla = [tabla[i:i + ancho] for i in range(0, len(tabla), ancho)]
+        automata.fallo = fallo = _desdeBytes("i", fallo)
+        
+        desplazamientos = _desdeBytes("i", desplazamientos)
+        propias = tuple(_desdeBytes("i", propias))
+        propias = [propias[inicio:fin] for inicio, fin in zip(desplazamientos, desplazamientos[1:])]
+        
+        # Las salidas de un estado son las propias más las de su estado de
+        # fallo, que ha de estar ya completo: se sube por la cadena de fallos
+        # hasta un estado completo y se completan los de la cadena al bajar
+        salidas = [None] * len(propias)
+        salidas[0] = propias[0]
+        for estado in range(len(propias)):
+            cadena = []
+            while salidas[estado] is None:
+                cadena.append(estado)
+                estado = fallo[estado]
+            for estado in reversed(cadena):
+                salidas[estado] = propias[estado] + salidas[fallo[estado]]
+        automata.salidas = salidas
+        return automata
+    
+    def _codificar(self, secuencia):
+        """Convierte la secuencia en la lista (o bytes) de códigos de carácter."""
+        if self._tabla_bytes is not None:
+            if isinstance(secuencia, str) and secuencia.isascii():
+                return secuencia.encode().translate(self._tabla_bytes)
+            if isinstance(secuencia, (bytes, bytearray)):
+                return secuencia.translate(self._tabla_bytes)
+        if isinstance(secuencia, (bytes, bytearray)):
+            secuencia = secuencia.decode(errors="replace")
+        otro = len(self.codigos)
+        return [self.codigos.get(caracter, otro) for caracter in secuencia]
+    
+    def buscar(self, secuencia):
+        """
+        Recorre la secuencia una vez y genera todos los sitios, incluidos
+        los solapados, por orden de su posición final. Los sitios con
+        códigos IUPAC ambiguos se buscan después con su patrón compilado.
+        
+        Genera:
+        - tuple: (posicion_inicio, nombre_enzima)
+        """
+        tabla, salidas = self.tabla, self.salidas
+        longitudes, nombres = self.longitudes, self.nombres
+        estado = 0
+        for fin, codigo in enumerate(self._codificar(secuencia), 1):
+            estado = tabla[estado][codigo]
+            if salidas[estado]:
+                for patron in salidas[estado]:
+                    yield fin - longitudes[patron], nombres[patron]
+        
+        binario = not isinstance(secuencia, str)
+        for nombre, sitio in self.degenerados.items():
+            for encontrado in compilaSitio(sitio, binario).finditer(secuencia):
+                yield encontrado.start(), nombre
+    
+    def primeras_apariciones(self, secuencia):
+        """
+        Posición de la primera aparición de cada enzima (la que daría
+        secuencia.find()). El recorrido termina en cuanto se han encontrado
+        todas las enzimas.
+        
+        Retorna:
+        - dict: {nombre_enzima: posicion}, solo con las enzimas que aparecen
+        """
+        tabla, salidas = self.tabla, self.salidas
+        longitudes, nombres = self.longitudes, self.nombres
+        
+        # find("") devuelve 0, igual que en catalizaSecuencia1Corte
+        primeras = dict.fromkeys(self.vacias, 0)
+        pendientes = len(nombres)
+        estado = 0
+        for fin, codigo in enumerate(self._codificar(secuencia), 1):
+            if not pendientes:
+                break
+            estado = tabla[estado][codigo]
+            if salidas[estado]:
+                for patron in salidas[estado]:
+                    nombre = nombres[patron]
+                    if nombre not in primeras:
+                        primeras[nombre] = fin - longitudes[patron]
+                        pendientes -= 1
+        
+        binario = not isinstance(secuencia, str)
+        for nombre, sitio in self.degenerados.items():
+            encontrado = compilaSitio(sitio, binario).search(secuencia)
+            if encontrado:
+                primeras[nombre] = encontrado.start()
+        return primeras
+
+
+# {ruta absoluta: (diccionario, autómata)}
+_cache_automatas = {}
+
+
+def cargaAutomataEnzimas(fichero="enzimas.txt"):
+    """
+    Devuelve el autómata de las enzimas de un fichero. Se construye una vez
+    y se reutiliza mientras cargaEnzimas devuelva el mismo diccionario (es
+    decir, mientras el fichero no cambie).
+    
+    Parámetros:
+    - fichero (str): Ruta del fichero con la información de las enzimas
+    
+    Retorna:
+    - AutomataEnzimas: Autómata con todas las enzimas del fichero
+    """
+    diccionario = cargaEnzimas(fichero)
+    ruta = os.path.abspath(fichero)
+    entrada = _cache_automatas.get(ruta)
+    if entrada is not None and entrada[0] is diccionario:
+        return entrada[1]
+    
+    # Si las enzimas vienen de una instantánea, el autómata también
+    pendiente = _automatas_instantanea.pop(ruta, None)
+    if pendiente is not None and pendiente[0] is diccionario:
+        automata = AutomataEnzimas._desde_estado(pendiente[1])
+    else:
+        automata = AutomataEnzimas(diccionario)
+    _cache_automatas[ruta] = (diccionario, automata)
+    return automata
+
+
+# ---------------------------------------------------------------------------
+# Instantánea binaria de la base de datos de enzimas
+# ---------------------------------------------------------------------------
+
+# Cabecera de la instantánea:
+# - 4 bytes mágicos
+# - versión de marshal, de Python y orden de bytes: los arrays se guardan tal
+#   cual están en memoria, así que la instantánea es propia de cada máquina
+# - SHA-256 del fichero de texto del que se generó
+_MAGICO_INSTANTANEA = b"ENZ1"
+_VERSION_INSTANTANEA = bytes([marshal.version, sys.version_info[0], sys.version_info[1]]) + sys.byteorder[:1].encode()
+_CABECERA_INSTANTANEA = len(_MAGICO_INSTANTANEA) + len(_VERSION_INSTANTANEA) + hashlib.sha256().digest_size
+
+
+# Autómatas leídos de una instantánea que aún no se han usado; se reconstruyen
+# en cargaAutomataEnzimas, así el arranque solo paga por el diccionario
+# {ruta absoluta: (diccionario, estado del autómata)}
+_automatas_instantanea = {}
+
+
+def _uneTextos(textos):
+    """Une una lista de textos sin saltos de línea en uno solo."""
+    return "\n".join(textos)
+
+
+def _separaTextos(texto, cantidad):
+    """
+    Inversa de _uneTextos. Hace falta saber cuántos textos había porque
+    tanto una lista vacía como [""] se guardan como texto vacío.
+    """
+    return texto.split("\n") if cantidad else []
+
+
+def _desdeBytes(tipo, datos):
+    """Convierte los bytes de un array del tipo dado en una lista de enteros."""
+    valores = array(tipo)
+    valores.frombytes(datos)
+    return valores.tolist()
+
+
+def _resumenFichero(fichero):
+    """SHA-256 del contenido de un fichero."""
+    with open(fichero, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def compilaInstantaneaEnzimas(fichero="enzimas.txt", instantanea=None):
+    """
+    Compila el fichero de enzimas en una instantánea binaria con lo que cuesta
+    calcular al cargarlo: el diccionario y el autómata de Aho-Corasick. Se
+    escribe primero en un fichero temporal y luego se renombra, para no dejar
+    nunca una instantánea a medias.
+    
+    Parámetros:
+    - fichero (str): Ruta del fichero de texto con las enzimas
+    - instantanea (str): Ruta de la instantánea (por defecto, fichero + ".bin")
+    
+    Retorna:
+    - str: Ruta de la instantánea escrita
+           None si el fichero no tiene enzimas (vacío o con errores): una
+           instantánea vacía se tomaría después por válida
+    """
+    if instantanea is None:
+        instantanea = fichero + ".bin"
+    
+    resumen = _resumenFichero(fichero)
+    diccionario = cargaEnzimas(fichero)
+    if not diccionario:
+        print(f"Error: No hay enzimas en {fichero}; no se escribe la instantánea")
+        return None
+    automata = cargaAutomataEnzimas(fichero)
+    
+    # Por columnas: pocos objetos grandes se cargan mucho más rápido
+    contenido = marshal.dumps((
+        _uneTextos(diccionario),
+        _uneTextos(secuencia for secuencia, _ in diccionario.values()),
+        array("q", [posicion for _, posicion in diccionario.values()]).tobytes(),
+        automata._estado(),
+    ))
+    
+    temporal = instantanea + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(_MAGICO_INSTANTANEA + _VERSION_INSTANTANEA + resumen)
+        f.write(contenido)
+    os.replace(temporal, instantanea)
+    return instantanea
+
+
+def cargaInstantaneaEnzimas(fichero="enzimas.txt", instantanea=None):
+    """
+    Carga las enzimas desde su instantánea binaria con una sola lectura, sin
+    volver a analizar el texto ni a construir el autómata. La instantánea solo
+    se usa si su SHA-256 coincide con el del fichero de texto actual; si no
+    existe, está dañada o es de otro fichero (o de otra versión de Python),
+    se vuelve a compilar.
+    
+    Lo cargado se guarda en las cachés de cargaEnzimas y cargaAutomataEnzimas,
+    así que después el resto de funciones lo reutilizan. El autómata no se
+    reconstruye hasta que alguna función lo necesita.
+    
+    Parámetros:
+    - fichero (str): Ruta del fichero de texto con las enzimas
+    - instantanea (str): Ruta de la instantánea (por defecto, fichero + ".bin")
+    
+    Retorna:
+    - dict: {nombre_enzima: [secuencia_reconocimiento, posicion_corte]}
+    """
+    if instantanea is None:
+        instantanea = fichero + ".bin"
+    
+    ruta = os.path.abspath(fichero)
+    try:
+        # La versión se toma antes de calcular el resumen: si el fichero
+        # cambia entre medias, la caché se invalidará en la próxima llamada
+        estado = os.stat(ruta)
+        resumen = _resumenFichero(ruta)
+    except OSError:
+        # Sin fichero no hay instantánea válida; creaDiccionario gestiona el error
+        return creaDiccionario(fichero)
+    
+    try:
+        with open(instantanea, "rb") as f:
+            datos = f.read()
+    except OSError:
+        datos = b""
+    
+    contenido = None
+    if datos[:_CABECERA_INSTANTANEA] == _MAGICO_INSTANTANEA + _VERSION_INSTANTANEA + resumen:
+        try:
+            contenido = marshal.loads(memoryview(datos)[_CABECERA_INSTANTANEA:])
+        except (EOFError, ValueError, TypeError):
+            contenido = None  # Instantánea dañada
+    
+    # Una instantánea sin enzimas no se usa ni se guarda en la caché (igual
+    # que cargaEnzimas no guarda las lecturas fallidas)
+    if contenido is not None and not contenido[2]:
+        contenido = None
+    
+    if contenido is None:
+        invalidaCacheEnzimas(fichero)
+        if compilaInstantaneaEnzimas(fichero, instantanea) is None:
+            return {}
+        return cargaEnzimas(fichero)
+    
+    nombres, secuencias, posiciones, estado_automata = contenido
+    posiciones = _desdeBytes("q", posiciones)
+    diccionario = dict(zip(_separaTextos(nombres, len(posiciones)),
+                           map(list, zip(_separaTextos(secuencias, len(posiciones)), posiciones))))
+    _cache_enzimas[ruta] = ((estado.st_mtime_ns, estado.st_size), diccionario)
+    _cache_automatas.pop(ruta, None)
+    _automatas_instantanea[ruta] = (diccionario, estado_automata)
+    return diccionario
+
+
+# ---------------------------------------------------------------------------
+# Digestión completa: todos los cortes, varias enzimas y ADN circular
+# ---------------------------------------------------------------------------
+
+# Resultado de una digestión:
+# - cortes: posiciones de corte ordenadas y sin repetir
+# - fragmentos: pares (inicio, fin) sobre la secuencia original; en ADN
+#   circular el fragmento que cruza el origen tiene fin > longitud
+Digestion = namedtuple("Digestion", ["cortes", "fragmentos"])
+
+# Con pocas enzimas es más rápido un find() por enzima (recorre en C) que el
+# autómata (un paso de Python por base); a partir de este número, el autómata
+_UMBRAL_AUTOMATA = 32
+
+# Digestiones ya preparadas:
+# {(ruta, enzimas, ambas_hebras): (sitios de cargaSitiosEnzimas, preparación)}
+_cache_digestiones = {}
+
+
+def _preparaDigestion(enzimas, fichero, ambas_hebras):
+    """
+    Prepara la búsqueda de los sitios de las enzimas de una digestión. Las
+    enzimas que no están en el fichero se ignoran (no cortan), igual que en
+    catalizaSecuencia1Corte. La preparación se guarda mientras el fichero
+    no cambie.
+    
+    Retorna:
+    - tuple: (literales, degenerados, automata, maximo, ambas_hebras)
+      * literales: {(nombre, hebra): [sitio, desplazamiento del corte]} de los
+        sitios sin códigos ambiguos; en la hebra -1, su complementario inverso
+      * degenerados: {nombre: SitioEnzima} de los sitios con códigos ambiguos
+      * automata: AutomataEnzimas de los literales, o None si son pocos
+      * maximo: longitud del sitio más largo
+    """
+    sitios = cargaSitiosEnzimas(fichero)
+    # Una sola pasada por enzimas: puede ser un generador, que se agotaría
+    # al construir la clave y ya no daría nada en el bucle
+    enzimas = (enzimas,) if isinstance(enzimas, str) else tuple(enzimas)
+    clave = (os.path.abspath(fichero), enzimas, ambas_hebras)
+    entrada = _cache_digestiones.get(clave)
+    if entrada is not None and entrada[0] is sitios:
+        return entrada[1]
+    
+    literales = {}
+    degenerados = {}
+    maximo = 0
+    for nombre in enzimas:
+        sitio = sitios.get(nombre)
+        if sitio is None or not sitio.longitud:
+            continue
+        maximo = max(maximo, sitio.longitud)
+        if sitio.degenerado:
+            degenerados[nombre] = sitio
+        else:
+            literales[(nombre, 1)] = [sitio.sitio, sitio.corte(0, 1)]
+            if ambas_hebras and not sitio.palindromico:
+                literales[(nombre, -1)] = [sitio.inverso, sitio.corte(0, -1)]
+    
+    automata = AutomataEnzimas(literales) if len(literales) > _UMBRAL_AUTOMATA else None
+    preparacion = (literales, degenerados, automata, maximo, ambas_hebras)
+    
+    if len(_cache_digestiones) >= 64:
+        _cache_digestiones.clear()
+    _cache_digestiones[clave] = (sitios, preparacion)
+    return preparacion
+
+
+def _sitios(preparacion, texto):
+    """Genera (inicio, corte, nombre_enzima) de todos los sitios, solapados incluidos."""
+    literales, degenerados, automata, _, ambas_hebras = preparacion
+    
+    if automata is not None:
+        for inicio, clave in automata.buscar(texto):
+            yield inicio, inicio + literales[clave][1], clave[0]
+    else:
+        binario = isinstance(texto, (bytes, bytearray))
+        for (nombre, _), (sitio, desplazamiento) in literales.items():
+            if binario:
+                sitio = sitio.encode()
+            inicio = texto.find(sitio)
+            while inicio != -1:
+                yield inicio, inicio + desplazamiento, nombre
+                inicio = texto.find(sitio, inicio + 1)
+    
+    for nombre, sitio in degenerados.items():
+        for inicio, hebra in sitio.sitios(texto, ambas_hebras):
+            yield inicio, sitio.corte(inicio, hebra), nombre
+
+
+def _digiere(preparacion, secuencia, circular):
+    """Calcula la digestión de una secuencia con las enzimas ya preparadas."""
+    longitud = len(secuencia)
+    texto = secuencia
+    maximo = preparacion[3]
+    if circular and longitud and maximo > 1:
+        # Añadimos el principio al final para ver los sitios que cruzan el origen
+        texto = secuencia + secuencia[:maximo - 1]
+    
+    cortes = set()
+    for inicio, corte, _ in _sitios(preparacion, texto):
+        if inicio >= longitud:
+            continue  # Sitio repetido de la copia del principio
+        if circular:
+            cortes.add(corte % longitud)
+        elif 0 < corte < longitud:
+            cortes.add(corte)
+    cortes = sorted(cortes)
+    
+    if not cortes:
+        fragmentos = [(0, longitud)]
+    elif circular:
+        fragmentos = list(zip(cortes, cortes[1:] + [cortes[0] + longitud]))
+    else:
+        fragmentos = list(zip([0] + cortes, cortes + [longitud]))
+    return Digestion(cortes, fragmentos)
+
+
+def digiereSecuencia(secuencia, enzimas, fichero="enzimas.txt", circular=False, ambas_hebras=True):
+    """
+    Simula la digestión completa de una secuencia con una o varias enzimas.
+    
+    A diferencia de catalizaSecuencia1Corte, corta en todos los sitios de
+    todas las enzimas y no copia la secuencia: devuelve las posiciones de
+    corte y los fragmentos como pares (inicio, fin).
+    
+    Parámetros:
+    - secuencia (str o bytes): Secuencia de ADN
+    - enzimas (str o iterable): Nombre de una enzima o nombres (lista,
+                                tupla, generador...)
+    - fichero (str): Fichero con la información de las enzimas
+    - circular (bool): Si la secuencia es circular (plásmido); entonces hay
+                       sitios que cruzan el origen y los cortes se toman
+                       módulo la longitud
+    - ambas_hebras (bool): Buscar también en la hebra complementaria los
+                           sitios no palindrómicos (ver SitioEnzima.corte)
+    
+    Los sitios pueden tener códigos IUPAC ambiguos (por ejemplo GGNNCC).
+    
+    Retorna:
+    - Digestion: (cortes, fragmentos). En lineal, los cortes fuera de la
+                 secuencia (en 0 o al final) no producen fragmentos
+    
+    Ejemplo:
+    digiereSecuencia("AGAATTCAAGAATTCA", "EcoRI") →
+        Digestion(cortes=[2, 10], fragmentos=[(0, 2), (2, 10), (10, 16)])
+    """
+    preparacion = _preparaDigestion(enzimas, fichero, ambas_hebras)
+    return _digiere(preparacion, secuencia, circular)
+
+
+def digiereLote(secuencias, enzimas, fichero="enzimas.txt", circular=False, ambas_hebras=True):
+    """
+    Digestión de muchas secuencias con las mismas enzimas. Las enzimas y el
+    autómata se preparan una sola vez para todo el lote.
+    
+    Parámetros:
+    - secuencias (iterable): Secuencias de ADN (str o bytes)
+    - enzimas, fichero, circular, ambas_hebras: Igual que en digiereSecuencia
+    
+    Genera:
+    - Digestion: Una por secuencia, en el mismo orden
+    """
+    preparacion = _preparaDigestion(enzimas, fichero, ambas_hebras)
+    for secuencia in secuencias:
+        yield _digiere(preparacion, secuencia, circular)
+
+
+def tamanosFragmentos(digestion):
+    """
+    Tamaños de los fragmentos de una digestión, de mayor a menor (el orden
+    en el que aparecerían en un gel).
+    """
+    return sorted((fin - inicio for inicio, fin in digestion.fragmentos), reverse=True)
+
+
+def vistasFragmentos(secuencia, digestion):
+    """
+    Genera el contenido de cada fragmento. Si la secuencia es bytes se
+    devuelven memoryview, sin copiar datos; el fragmento que cruza el origen
+    de una secuencia circular sí se tiene que copiar para unir sus dos partes.
+    """
+    datos = memoryview(secuencia) if isinstance(secuencia, (bytes, bytearray)) else secuencia
+    longitud = len(secuencia)
+    for inicio, fin in digestion.fragmentos:
+        if fin <= longitud:
+            yield datos[inicio:fin]
+        else:
+            yield secuencia[inicio:] + secuencia[:fin - longitud]
+
+
+# ---------------------------------------------------------------------------
+# Mapa de restricción de un FASTA completo en paralelo
+# ---------------------------------------------------------------------------
+
+# Digestión preparada en cada proceso del pool (ver _iniciaMapa):
+# (preparacion, {nombre_enzima: orden en la lista de enzimas})
+_mapa_trabajador = None
+
+
+def _registrosFasta(nomfich):
+    """
+    Lee un FASTA (o FASTA.gz) registro a registro sin cargarlo entero.
+    
+    Cada registro sí se tiene entero en memoria (una sola copia: las líneas
+    se pasan a mayúsculas al leerlas y se unen al final), así que la memoria
+    depende del registro más largo, no del tamaño del fichero.
+    
+    Genera:
+    - tuple: (nombre, secuencia) con el nombre como str (primera palabra de
+             la cabecera) y la secuencia como bytes en mayúsculas, para que
+             las zonas enmascaradas en minúsculas también se corten
+    """
+    with open(nomfich, "rb") as f:
+        comprimido = f.read(2) == b"\x1f\x8b"
+    
+    with (gzip.open(nomfich, "rb") if comprimido else open(nomfich, "rb")) as f:
+        nombre = None
+        partes = []
+        for linea in f:
+            if linea.startswith(b">"):
+                if nombre is not None:
+                    yield nombre, b"".join(partes)
+                palabras = linea[1:].split()
+                nombre = palabras[0].decode(errors="replace") if palabras else ""
+                partes = []
+            elif nombre is not None:
+                partes.append(linea.strip().upper())
+        if nombre is not None:
+            yield nombre, b"".join(partes)
+
+
+def _lotesRegistros(registros, tam_lote):
+    """Agrupa los registros en listas de unas tam_lote bases como mínimo."""
+    lote = []
+    bases = 0
+    for registro in registros:
+        lote.append(registro)
+        bases += len(registro[1])
+        if bases >= tam_lote:
+            yield lote
+            lote = []
+            bases = 0
+    if lote:
+        yield lote
+
+
+def _iniciaMapa(fichero, enzimas, ambas_hebras):
+    """
+    Inicializador de los procesos del pool: prepara las enzimas una sola vez
+    por proceso. Si el pool se crea con fork, la preparación ya está en la
+    caché heredada del proceso principal y no se repite.
+    """
+    global _mapa_trabajador
+    preparacion = _preparaDigestion(enzimas, fichero, ambas_hebras)
+    _mapa_trabajador = (preparacion, {nombre: i for i, nombre in enumerate(enzimas)})
+
+
+def _mapeaLote(lote):
+    """
+    Calcula los cortes de un lote de registros con las enzimas del proceso.
+    
+    Retorna:
+    - str: Líneas del TSV del lote (registro, enzima, cortes separados por comas)
+    """
+    preparacion, orden = _mapa_trabajador
+    lineas = []
+    for nombre, secuencia in lote:
+        longitud = len(secuencia)
+        cortes = {}
+        for _, corte, enzima in _sitios(preparacion, secuencia):
+            if 0 < corte < longitud:
+                cortes.setdefault(enzima, set()).add(corte)
+        for enzima in sorted(cortes, key=orden.__getitem__):
+            posiciones = ",".join(map(str, sorted(cortes[enzima])))
+            lineas.append(f"{nombre}\t{enzima}\t{posiciones}\n")
+    return "".join(lineas)
+
+
+def mapaRestriccionFasta(nomfich, salida="mapa_restriccion.tsv", fichero="enzimas.txt",
+                         enzimas=None, procesos=None, tam_lote=1 << 22, ambas_hebras=True):
+    """
+    Calcula todos los cortes de todas las enzimas en cada registro de un
+    FASTA, que puede ser de varios GB: los registros se leen en streaming, se
+    agrupan en lotes y se reparten entre un pool de procesos que preparan las
+    enzimas una sola vez cada uno.
+    
+    Los lotes se escriben en el orden del fichero, así la salida es siempre
+    la misma sea cual sea el número de procesos. Solo hay unos pocos lotes
+    pendientes a la vez, por lo que la memoria no depende del tamaño del
+    FASTA. Eso sí, cada registro se lee y se procesa entero: un cromosoma
+    de 250 Mb ocupa 250 MB en el proceso principal y en el trabajador que
+    lo recibe.
+    
+    El fichero de salida tendrá el formato (separado por tabuladores):
+    registro    enzima    corte1,corte2,...
+    
+    con una línea por cada enzima que corta el registro, en el orden de las
+    enzimas. Los cortes son los de digiereSecuencia (ADN lineal).
+    
+    Parámetros:
+    - nomfich (str): Fichero FASTA (o FASTA.gz)
+    - salida (str): Fichero TSV de resultados
+    - fichero (str): Fichero con la información de las enzimas
+    - enzimas (list): Enzimas a usar (None = todas las del fichero)
+    - procesos (int): Número de procesos (None = número de CPUs)
+    - tam_lote (int): Bases por lote aproximadamente
+    - ambas_hebras (bool): Igual que en digiereSecuencia
+    
+    Retorna:
+    - int: Número de registros procesados (-1 si hay un error)
+    """
+    try:
+        # Se comprueba la entrada antes de crear el fichero de salida
+        os.stat(nomfich)
+        
+        if enzimas is None:
+            enzimas = list(cargaEnzimas(fichero))
+        elif isinstance(enzimas, str):
+            enzimas = [enzimas]
+        
+        # Se prepara antes de crear el pool para que, con fork, los procesos
+        # hereden la preparación en lugar de repetirla
+        _preparaDigestion(enzimas, fichero, ambas_hebras)
+        
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        registros = 0
+        pendientes = deque()
+        with Pool(procesos, _iniciaMapa, (fichero, enzimas, ambas_hebras)) as pool, \
+                open(salida, "w") as f_salida:
+            f_salida.write("registro\tenzima\tcortes\n")
+            for lote in _lotesRegistros(_registrosFasta(nomfich), tam_lote):
+                registros += len(lote)
+                pendientes.append(pool.apply_async(_mapeaLote, (lote,)))
+                # Como mucho dos lotes por proceso en espera; se escriben en orden
+                if len(pendientes) >= 2 * procesos:
+                    f_salida.write(pendientes.popleft().get())
+            while pendientes:
+                f_salida.write(pendientes.popleft().get())
+    
+    except FileNotFoundError as e:
+        print(f"Error: No se encontró el fichero {e.filename}")
+        return -1
+    except Exception as e:
+        print(f"Error procesando el fichero: {e}")
+        return -1
+    
+    return registros
+
+
 # Función auxiliar para visualizar mejor los cortes
 def visualizar_corte(nombre_enzima, secuencia, fichero="enzimas.txt"):
     """
     Función auxiliar para visualizar dónde corta una enzima.
     Útil para debugging y comprensión.
     """
-    diccionario = creaDiccionario(fichero)
+    diccionario = cargaEnzimas(fichero)
     
     if nombre_enzima in diccionario:
         sec_rec = diccionario[nombre_enzima][0]
         pos = diccionario[nombre_enzima][1]
         
-        idx = secuencia.find(sec_rec)
+        # El mismo sitio compilado que usa catalizaSecuencia1Corte, así que
+        # los sitios con códigos IUPAC (CCNNGG) también se encuentran
+        idx = cargaSitiosEnzimas(fichero)[nombre_enzima].primera(secuencia)
         if idx != -1:
             print(f"\nEnzima: {nombre_enzima}")
+            encontrado = secuencia[idx:idx + len(sec_rec)]
+            if encontrado != sec_rec:
+                sec_rec = f"{sec_rec} ({encontrado})"
             print(f"Reconoce: {sec_rec} en posición {idx}")
             print(f"Corta en posición relativa: {pos}")
             
@@ -218,8 +1203,15 @@ NotI;2;GCGGCCGC"""
     resultado3 = catalizaSecuencia1Corte("XyzI", secADN1, "enzimas_prueba.txt")
     print(f"Resultado: {resultado3}")
     
-    # Prueba 5: catalizaSecuenciaTodasEnzimas
-    print("\n5. Prueba catalizaSecuenciaTodasEnzimas:")
+    # Prueba 5: caché de enzimas
+    print("\n5. Prueba cargaEnzimas (caché):")
+    print(f"Misma lectura en dos llamadas: {cargaEnzimas('enzimas_prueba.txt') is cargaEnzimas('enzimas_prueba.txt')}")
+    invalidaCacheEnzimas("enzimas_prueba.txt")
+    print(f"Enzimas tras invalidar la caché: {len(cargaEnzimas('enzimas_prueba.txt'))}")
+    print("Esperado: True y 5 enzimas")
+    
+    # Prueba 6: catalizaSecuenciaTodasEnzimas
+    print("\n6. Prueba catalizaSecuenciaTodasEnzimas:")
     secADN3 = "AAAGAATTCGGGTACCGATATCCTGCAGGGGCCCGGGCGT"
     catalizaSecuenciaTodasEnzimas(secADN3, "salida_prueba.txt", "enzimas_prueba.txt")
     
@@ -229,4 +1221,58 @@ NotI;2;GCGGCCGC"""
             contenido = f.read()
             print(contenido if contenido else "  (Ninguna enzima cortó la secuencia)")
     except:
-        print("  Error al leer el fichero de salida")
\ No newline at end of file
+        print("  Error al leer el fichero de salida")
+    
+    # Prueba 7: todos los sitios con el autómata
+    print("\n7. Prueba AutomataEnzimas.buscar:")
+    automata = cargaAutomataEnzimas("enzimas_prueba.txt")
+    print(f"Sitios: {list(automata.buscar(secADN3))}")
+    print("Esperado: [(3, 'EcoRI'), (22, 'PstI'), (30, 'SrfI')]")
+    
+    # Prueba 8: digestión completa con varias enzimas
+    print("\n8. Prueba digiereSecuencia (EcoRI + PstI):")
+    digestion = digiereSecuencia(secADN3, ["EcoRI", "PstI"], "enzimas_prueba.txt")
+    print(f"Cortes: {digestion.cortes}, fragmentos: {digestion.fragmentos}")
+    print("Esperado: Cortes: [4, 27], fragmentos: [(0, 4), (4, 27), (27, 40)]")
+    plasmido = "AATTCAAAAAAAAAGCTGCAGTTTTG"
+    digestion = digiereSecuencia(plasmido, ["EcoRI", "PstI"], "enzimas_prueba.txt", circular=True)
+    print(f"Circular: cortes {digestion.cortes}, tamaños {tamanosFragmentos(digestion)}")
+    print("Esperado: Circular: cortes [0, 20], tamaños [20, 6]")
+    
+    # Prueba 9: sitios degenerados (IUPAC) y no palindrómicos
+    print("\n9. Prueba sitios IUPAC:")
+    with open("enzimas_iupac.txt", "w") as f:
+        f.write("HaeIII;2;GGCC\nBsaJI;1;CCNNGG\nBsaI;7;GGTCTC\n")
+    secADN4 = "AACCATGGTTTGAGACCAAAA"
+    print(f"BsaJI: {catalizaSecuencia1Corte('BsaJI', secADN4, 'enzimas_iupac.txt')}")
+    print("Esperado: BsaJI: ['AAC', 'CATGGTTTGAGACCAAAA']")
+    digestion = digiereSecuencia(secADN4, ["BsaJI", "BsaI"], "enzimas_iupac.txt")
+    print(f"Cortes BsaJI + BsaI (ambas hebras): {digestion.cortes}")
+    print("Esperado: Cortes BsaJI + BsaI (ambas hebras): [3, 10]")
+    
+    # Prueba 10: instantánea binaria de las enzimas
+    print("\n10. Prueba instantánea binaria:")
+    compilaInstantaneaEnzimas("enzimas_prueba.txt")
+    invalidaCacheEnzimas()
+    enzimas = cargaInstantaneaEnzimas("enzimas_prueba.txt")
+    print(f"Igual que el texto: {enzimas == creaDiccionario('enzimas_prueba.txt')}")
+    print(f"Sitios: {list(cargaAutomataEnzimas('enzimas_prueba.txt').buscar(secADN3))}")
+    print("Esperado: Igual que el texto: True; mismos sitios que en la prueba 7")
+    
+    # Prueba 11: mapa de restricción de un FASTA en paralelo
+    print("\n11. Prueba mapaRestriccionFasta:")
+    with open("prueba_mapa.fasta", "w") as f:
+        f.write(f">sec1 ejemplo\n{secADN3[:20]}\n{secADN3[20:]}\n>sec2\nttgaattcaaa\n>sec3\nAAAA\n")
+    registros = mapaRestriccionFasta("prueba_mapa.fasta", "mapa_prueba.tsv", "enzimas_prueba.txt", procesos=2)
+    print(f"Registros: {registros}")
+    with open("mapa_prueba.tsv") as f:
+        print(f.read(), end="")
+    print("Esperado: Registros: 3; sec1 EcoRI 4, SrfI 34, PstI 27; sec2 EcoRI 3")
+    
+    # Prueba 12: enzimas dadas con un generador
+    print("\n12. Prueba digiereSecuencia con un generador de enzimas:")
+    # Con ambas_hebras=False no se reutiliza la preparación de la prueba 8
+    generador = (nombre for nombre in ["EcoRI", "PstI"])
+    digestion = digiereSecuencia(secADN3, generador, "enzimas_prueba.txt", ambas_hebras=False)
+    print(f"Cortes: {digestion.cortes}")
+    print("Esperado: Cortes: [4, 27]")
@@ -1,6 +1,9 @@
 # Nombre: [Tu nombre aquí]
 # Turno: [Tu turno aquí]
 
+import os
+
+
 def creaDiccionario(fichero="enzimas.txt"):
     """
     Función que lee un fichero de enzimas y crea un diccionario con la información.
@@ -49,6 +52,65 @@ def creaDiccionario(fichero="enzimas.txt"):
     return diccionario
 
 
+# ---------------------------------------------------------------------------
+# Caché de la base de datos de enzimas
+# ---------------------------------------------------------------------------
+
+# Misma caché que cargaEnzimas/invalidaCacheEnzimas de Julio-2021/eje1.py.
+# Cada examen es una carpeta independiente que se ejecuta por separado, así
+# que se copia aquí en lugar de importarla; un cambio en una copia hay que
+# llevarlo también a la otra.
+
+# {ruta absoluta: ((mtime_ns, tamaño), diccionario)}
+_cache_enzimas = {}
+
+
+def cargaEnzimas(fichero="enzimas.txt"):
+    """
+    Devuelve el diccionario de enzimas de un fichero leyéndolo solo una vez
+    por proceso: se guarda en una caché asociado a la ruta del fichero y a
+    su fecha de modificación y tamaño, y se vuelve a leer solo si cambian.
+    
+    El diccionario devuelto es compartido, no debe modificarse (para tener
+    una copia propia, usar creaDiccionario).
+    
+    Parámetros:
+    - fichero (str): Ruta del fichero con la información de las enzimas
+    
+    Retorna:
+    - dict: {nombre_enzima: [secuencia_reconocimiento, posicion_corte]}
+    """
+    ruta = os.path.abspath(fichero)
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        # Sin fichero no hay nada que guardar; creaDiccionario gestiona el error
+        return creaDiccionario(fichero)
+    
+    version = (estado.st_mtime_ns, estado.st_size)
+    entrada = _cache_enzimas.get(ruta)
+    if entrada is not None and entrada[0] == version:
+        return entrada[1]
+    
+    diccionario = creaDiccionario(fichero)
+    # creaDiccionario devuelve {} si hay un error (formato incorrecto...): no
+    # se guarda, así la próxima llamada lo vuelve a intentar y a avisar
+    if diccionario:
+        _cache_enzimas[ruta] = (version, diccionario)
+    return diccionario
+
+
+def invalidaCacheEnzimas(fichero=None):
+    """
+    Borra de la caché las enzimas de un fichero (o todas si fichero es None),
+    para forzar que se vuelvan a leer en la próxima llamada.
+    """
+    if fichero is None:
+        _cache_enzimas.clear()
+    else:
+        _cache_enzimas.pop(os.path.abspath(fichero), None)
+
+
 def catalizaSecuencia1Corte(nombre_enzima, secuencia, fichero="enzimas.txt"):
     """
     Función que divide una secuencia de ADN según la información de una enzima específica.
@@ -67,8 +129,8 @@ def catalizaSecuencia1Corte(nombre_enzima, secuencia, fichero="enzimas.txt"):
     - Encuentra la secuencia de reconocimiento en el ADN
     - Corta en la posición indicada relativa al inicio de la secuencia encontrada
     """
-    # Obtenemos el diccionario de enzimas del fichero
-    diccionario = creaDiccionario(fichero)
+    # Obtenemos el diccionario de enzimas del fichero (leído una sola vez, ver cargaEnzimas)
+    diccionario = cargaEnzimas(fichero)
     
     # Si la enzima no está en el diccionario, devolvemos la secuencia completa
     if nombre_enzima not in diccionario:
@@ -115,7 +177,7 @@ def catalizaSecuenciaTodasEnzimas(secuencia, nfs="catalizadoras.txt", nfe="enzim
     - Formato salida: nombre_enzima;fragmento1;fragmento2
     """
     # Obtenemos el diccionario de todas las enzimas
-    diccionario = creaDiccionario(nfe)
+    diccionario = cargaEnzimas(nfe)
     
     # Abrimos el fichero de salida para escritura
     with open(nfs, 'w') as f_salida: